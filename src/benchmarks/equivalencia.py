@@ -0,0 +1,337 @@
+"""Confere que uma implementação candidata gera as mesmas saídas da referência.
+
+Roda duas árvores de código (uma revisão do git e a árvore de trabalho, por
+padrão) sobre as mesmas entradas sintéticas e compara as planilhas geradas
+célula a célula: VALOR até a fração de centavo (sem o ruído do float), as
+demais colunas por valor e tipo. Também confere que débitos = créditos e que a
+SEQUENCIA vai de 1 a N sem falhas (quando a referência respeita essas regras).
+Para cada caso, mostra a primeira divergência.
+
+Cada implementação roda em um processo próprio, com as entradas copiadas para
+uma pasta separada (o cache de entradas de uma não é lido pela outra).
+
+Uso (a partir de ``src``)::
+
+    python -m benchmarks.equivalencia --referencia git:HEAD
+    python -m benchmarks.equivalencia --referencia git:main --candidata src:/outra/src
+    python -m benchmarks.equivalencia --entrada /pasta/com/entradas
+"""
+
+import argparse
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+from decimal import Decimal
+from typing import NamedTuple
+
+import openpyxl
+
+from benchmarks.sinteticos import VARIANTES_VALOR, planilha_em_cache
+
+PASTA_SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RAIZ_REPOSITORIO = os.path.dirname(PASTA_SRC)
+TIPOS = ("ME", "OD", "RF")
+TAMANHOS = [1_000, 10_000]
+SEMENTES = [0, 1, 2]
+CODIGO_AL = "AL 123"
+MES_REFERENCIA = "202403"
+FRACAO = Decimal("0.0001")  # de centavo, como FRACOES_POR_CENTAVO
+
+# Executado em um processo novo para cada implementação. Aceita tanto a
+# tabela de regras atual quanto os antigos processar_me/od/rf, e o mês como
+# contexto da execução ou como AAAAMM. Nas árvores sem o mês como parâmetro,
+# que usam o mês anterior ao de hoje, o relógio de utils.helpers é fixado no
+# dia 15 do mês seguinte a MES_REFERENCIA.
+EXECUTOR = """
+import datetime, importlib, inspect, sys, types
+src, tipo, entrada, saida, log, codigo_al, mes = sys.argv[1:8]
+sys.path.insert(0, src)
+try:
+    from processamento.execucao import PROCESSADORES
+    processar = PROCESSADORES[tipo + ".xlsx"]
+except (ImportError, AttributeError):
+    modulo = importlib.import_module("processamento." + tipo.lower())
+    processar = getattr(modulo, "processar_" + tipo.lower())
+argumentos = [entrada, saida, codigo_al, log]
+parametros = inspect.signature(processar).parameters
+if "contexto" in parametros:
+    from processamento.contexto import criar_contexto
+    argumentos.append(criar_contexto(mes))
+elif "mes_referencia" in parametros:
+    argumentos.append(mes)
+else:
+    import utils.helpers
+    ano, numero = int(mes[:4]), int(mes[4:])
+    hoje = datetime.datetime(ano + numero // 12, numero % 12 + 1, 15)
+
+    class Relogio(datetime.datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return hoje
+
+    utils.helpers.datetime = types.SimpleNamespace(
+        datetime=Relogio, timedelta=datetime.timedelta
+    )
+processar(*argumentos)
+"""
+
+
+class Divergencia(NamedTuple):
+    linha: int
+    coluna: str
+    referencia: object
+    candidata: object
+
+
+class Comparacao(NamedTuple):
+    divergencias: int
+    primeira: Divergencia | None
+    invariantes: list[str]
+
+
+def preparar_implementacao(especificacao, pasta) -> str:
+    """Devolve a pasta ``src`` de ``git:<revisão>`` ou ``src:<caminho>``."""
+    tipo, _, alvo = especificacao.partition(":")
+    if tipo == "src":
+        return os.path.abspath(alvo or PASTA_SRC)
+    if tipo != "git":
+        raise ValueError(f"Implementação inválida: {especificacao!r}")
+    conteudo = subprocess.run(
+        ["git", "-C", RAIZ_REPOSITORIO, "archive", "--format=tar", alvo, "src"],
+        check=True,
+        capture_output=True,
+    ).stdout
+    with tarfile.open(fileobj=io.BytesIO(conteudo)) as arquivo:
+        arquivo.extractall(pasta, filter="data")
+    return os.path.join(pasta, "src")
+
+
+def executar_implementacao(src, tipo, entrada, pasta) -> str | None:
+    """Processa uma cópia de ``entrada`` com a árvore ``src``; retorna a saída."""
+    os.makedirs(pasta, exist_ok=True)
+    copia = os.path.join(pasta, os.path.basename(entrada))
+    shutil.copy2(entrada, copia)
+    saida = os.path.join(pasta, f"saida_{tipo}.xlsx")
+    processo = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            EXECUTOR,
+            src,
+            tipo,
+            copia,
+            saida,
+            os.path.join(pasta, f"log_{tipo}.txt"),
+            CODIGO_AL,
+            MES_REFERENCIA,
+        ],
+        cwd=src,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    if processo.returncode != 0:
+        raise RuntimeError(f"{src} falhou em {tipo}:\n{processo.stderr}")
+    return saida if os.path.exists(saida) else None
+
+
+def ler_saida(caminho) -> tuple[list, list[tuple]]:
+    workbook = openpyxl.load_workbook(caminho, read_only=True)
+    try:
+        linhas = list(workbook.active.iter_rows(values_only=True))
+    finally:
+        workbook.close()
+    if not linhas:
+        return [], []
+    return list(linhas[0]), [tuple(linha) for linha in linhas[1:]]
+
+
+def _em_fracoes(valor):
+    """Valor da planilha em centavos, com quatro casas; ``None`` se não for número.
+
+    O ruído de somar floats (1232528.880000001) fica abaixo de uma fração de
+    centavo e é descartado antes da comparação.
+    """
+    if valor is None or isinstance(valor, (str, bool)):
+        return None
+    return (Decimal(repr(valor)) * 100).quantize(FRACAO)
+
+
+def em_centavos(valor):
+    """Valor da planilha em centavos inteiros; ``None`` se não for dinheiro."""
+    centavos = _em_fracoes(valor)
+    if centavos is None or centavos != centavos.to_integral_value():
+        return None
+    return int(centavos)
+
+
+def _normalizar(coluna, valor):
+    if coluna == "VALOR" and _em_fracoes(valor) is not None:
+        return ("centavos", _em_fracoes(valor), valor)
+    if valor in (None, ""):
+        return ("vazio", None, valor)
+    if isinstance(valor, str):
+        return ("texto", valor, valor)
+    return ("número", Decimal(repr(valor)), valor)
+
+
+def verificar_invariantes(cabecalho, linhas) -> dict[str, str]:
+    """Débitos = créditos, VALOR em centavos exatos e SEQUENCIA de 1 a N.
+
+    Retorna os problemas encontrados, indexados por um identificador estável
+    (``"saldo"``, ``"sequencia"``, ``"valor:<linha>"``...).
+    """
+    posicao = {coluna: i for i, coluna in enumerate(cabecalho)}
+    valor, indicador, sequencia = (
+        posicao.get("VALOR"),
+        posicao.get("INDICADOR DE CONTA"),
+        posicao.get("SEQUENCIA"),
+    )
+    if None in (valor, indicador, sequencia):
+        return {"colunas": "colunas VALOR, INDICADOR DE CONTA ou SEQUENCIA ausentes"}
+
+    problemas = {}
+    saldo = {"D": 0, "C": 0}
+    for numero, linha in enumerate(linhas, start=2):
+        centavos = em_centavos(linha[valor])
+        if centavos is None:
+            problemas[f"valor:{numero}"] = (
+                f"linha {numero}: VALOR {linha[valor]!r} não é exato em centavos"
+            )
+        elif linha[indicador] not in saldo:
+            problemas[f"indicador:{numero}"] = (
+                f"linha {numero}: indicador {linha[indicador]!r}"
+            )
+        else:
+            saldo[linha[indicador]] += centavos
+    if saldo["D"] != saldo["C"]:
+        problemas["saldo"] = (
+            f"débitos {saldo['D'] / 100:.2f} ≠ créditos {saldo['C'] / 100:.2f}"
+        )
+    sequencias = [linha[sequencia] for linha in linhas]
+    if sequencias != list(range(1, len(linhas) + 1)):
+        problemas["sequencia"] = "SEQUENCIA não vai de 1 a N em ordem"
+    return problemas
+
+
+def comparar_saidas(referencia, candidata) -> Comparacao:
+    cabecalho_ref, linhas_ref = ler_saida(referencia)
+    cabecalho_cand, linhas_cand = ler_saida(candidata)
+    # Só conta o que a candidata quebra e a referência respeita: a OD, por
+    # exemplo, arredonda CPFs e desconto separadamente e não fecha no centavo.
+    da_referencia = verificar_invariantes(cabecalho_ref, linhas_ref)
+    invariantes = [
+        f"candidata: {problema}"
+        for chave, problema in verificar_invariantes(
+            cabecalho_cand, linhas_cand
+        ).items()
+        if chave not in da_referencia
+    ]
+    if cabecalho_ref != cabecalho_cand:
+        primeira = Divergencia(1, "(cabeçalho)", cabecalho_ref, cabecalho_cand)
+        return Comparacao(1, primeira, invariantes)
+
+    divergencias = 0
+    primeira = None
+    for numero in range(max(len(linhas_ref), len(linhas_cand))):
+        linha_ref = linhas_ref[numero] if numero < len(linhas_ref) else None
+        linha_cand = linhas_cand[numero] if numero < len(linhas_cand) else None
+        if linha_ref is None or linha_cand is None:
+            divergencias += 1
+            primeira = primeira or Divergencia(
+                numero + 2, "(linha ausente)", linha_ref, linha_cand
+            )
+            continue
+        for coluna, valor_ref, valor_cand in zip(cabecalho_ref, linha_ref, linha_cand):
+            a, b = _normalizar(coluna, valor_ref), _normalizar(coluna, valor_cand)
+            if a[:2] != b[:2] or a[1] is None and a[2] != b[2]:
+                divergencias += 1
+                primeira = primeira or Divergencia(
+                    numero + 2, coluna, valor_ref, valor_cand
+                )
+    return Comparacao(divergencias, primeira, invariantes)
+
+
+def casos_sinteticos(tipos, tamanhos, sementes):
+    for tipo in tipos:
+        for linhas in tamanhos:
+            for semente in sementes:
+                for variante in VARIANTES_VALOR:
+                    caminho = planilha_em_cache(
+                        tipo, linhas, variante_valor=variante, semente=semente
+                    )
+                    yield f"{tipo}/{linhas}/{variante}/semente {semente}", tipo, caminho
+
+
+def casos_da_pasta(pasta, tipos):
+    for tipo in tipos:
+        caminho = os.path.join(pasta, f"{tipo}.xlsx")
+        if os.path.exists(caminho):
+            yield f"{tipo} ({pasta})", tipo, caminho
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--referencia", default="git:HEAD")
+    parser.add_argument("--candidata", default=f"src:{PASTA_SRC}")
+    parser.add_argument("--tipos", nargs="+", default=list(TIPOS))
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=TAMANHOS)
+    parser.add_argument("--sementes", type=int, nargs="+", default=SEMENTES)
+    parser.add_argument(
+        "--entrada", help="pasta com entradas reais, em vez das sintéticas"
+    )
+    args = parser.parse_args(argv)
+
+    casos = (
+        casos_da_pasta(args.entrada, args.tipos)
+        if args.entrada
+        else casos_sinteticos(args.tipos, args.tamanhos, args.sementes)
+    )
+    falhas = 0
+    with tempfile.TemporaryDirectory() as pasta:
+        referencia = preparar_implementacao(args.referencia, os.path.join(pasta, "ref"))
+        candidata = preparar_implementacao(args.candidata, os.path.join(pasta, "cand"))
+        for numero, (nome, tipo, entrada) in enumerate(casos):
+            caso = os.path.join(pasta, f"caso_{numero}")
+            saida_ref = executar_implementacao(
+                referencia, tipo, entrada, os.path.join(caso, "ref")
+            )
+            saida_cand = executar_implementacao(
+                candidata, tipo, entrada, os.path.join(caso, "cand")
+            )
+            if saida_ref is None or saida_cand is None:
+                if saida_ref is None and saida_cand is None:
+                    print(f"= {nome}: nenhuma gerou saída")
+                else:
+                    falhas += 1
+                    print(f"≠ {nome}: só uma das implementações gerou saída")
+                continue
+
+            comparacao = comparar_saidas(saida_ref, saida_cand)
+            if comparacao.divergencias or comparacao.invariantes:
+                falhas += 1
+                print(f"≠ {nome}: {comparacao.divergencias} célula(s) divergente(s)")
+                if comparacao.primeira:
+                    d = comparacao.primeira
+                    print(
+                        f"    primeira: linha {d.linha}, {d.coluna}: "
+                        f"{d.referencia!r} (referência) × {d.candidata!r} (candidata)"
+                    )
+                for problema in comparacao.invariantes:
+                    print(f"    {problema}")
+            else:
+                print(f"= {nome}")
+
+    if falhas:
+        print(f"\n{falhas} caso(s) divergente(s).")
+        return 1
+    print("\nTudo equivalente.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
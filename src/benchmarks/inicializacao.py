@@ -0,0 +1,65 @@
+"""Mede a partida a frio da CLI.
+
+Roda ``cli.py --help`` em processos novos e confere que nem a CLI nem o
+pipeline de processamento importam Tk/customtkinter.
+
+Uso (a partir de ``src``): ``python -m benchmarks.inicializacao``
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PASTA_SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPETICOES = 5
+META_AJUDA_SEGUNDOS = 0.5
+META_PIPELINE_SEGUNDOS = 2.0
+MODULOS_GUI = ("tkinter", "customtkinter", "PIL")
+
+VERIFICAR_GUI = (
+    "import sys, processamento.execucao; "
+    f"print(','.join(m for m in {MODULOS_GUI!r} if m in sys.modules))"
+)
+
+
+def medir(argumentos) -> float:
+    tempos = []
+    for _ in range(REPETICOES):
+        inicio = time.perf_counter()
+        subprocess.run(
+            [sys.executable, *argumentos],
+            cwd=PASTA_SRC,
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos)
+
+
+def main() -> int:
+    ajuda = medir(["cli.py", "--help"])
+    pipeline = medir(["-c", "import processamento.execucao"])
+    gui = subprocess.run(
+        [sys.executable, "-c", VERIFICAR_GUI],
+        cwd=PASTA_SRC,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+    print(f"cli.py --help:            {ajuda:6.3f} s (meta {META_AJUDA_SEGUNDOS} s)")
+    print(
+        f"import do processamento:  {pipeline:6.3f} s (meta {META_PIPELINE_SEGUNDOS} s)"
+    )
+    print(f"módulos de GUI carregados: {gui or 'nenhum'}")
+
+    dentro_da_meta = (
+        ajuda <= META_AJUDA_SEGUNDOS and pipeline <= META_PIPELINE_SEGUNDOS and not gui
+    )
+    return 0 if dentro_da_meta else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""Benchmark do montador de lançamentos por CPF.
+
+Compara o laço antigo (filtro booleano + cópia do template por CPF) com o
+montador colunar e mostra o tempo por linha, que deve ficar estável conforme
+o número de CPFs cresce, e a memória ocupada pelos lançamentos montados.
+
+Uso (a partir de ``src``): ``python -m benchmarks.lancamentos``
+"""
+
+import time
+
+import pandas as pd
+
+from config import TEMPLATE_IMPORTACAO_BASE
+from processamento.lancamentos import BlocoLancamentos, montar_lancamentos
+
+TAMANHOS = [1_000, 10_000, 50_000, 200_000]
+LIMITE_LACO_ANTIGO = 10_000
+
+CAMPOS = {
+    "DATA DO LANCAMENTO": "20240331",
+    "DOCUMENTO": "ME0324",
+    "HISTORICO": "MENSALIDADE ESPORTE (AL 123 SESC) 03/2024",
+}
+
+
+def gerar_agrupado(total: int) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "CPF": range(total),
+            "VALOR": [(i % 50_000) / 100 for i in range(total)],
+        }
+    )
+
+
+def laco_antigo(df_agrupado: pd.DataFrame) -> pd.DataFrame:
+    planilha_final = []
+    sequencia = 1
+    for cpf in df_agrupado["CPF"]:
+        valores_cpf = df_agrupado[df_agrupado["CPF"] == cpf]
+        template = TEMPLATE_IMPORTACAO_BASE.copy()
+        template.update(CAMPOS)
+        template.update(
+            {
+                "VALOR": valores_cpf["VALOR"].values[0],
+                "SEQUENCIA": sequencia,
+                "CLIENTE": f"{cpf:011d}",
+            }
+        )
+        planilha_final.append(template)
+        sequencia += 1
+    return pd.DataFrame(planilha_final)
+
+
+def montador_colunar(df_agrupado: pd.DataFrame) -> BlocoLancamentos:
+    return montar_lancamentos(df_agrupado["CPF"], df_agrupado["VALOR"], CAMPOS)
+
+
+def medir(funcao, df_agrupado: pd.DataFrame) -> tuple[float, object]:
+    inicio = time.perf_counter()
+    resultado = funcao(df_agrupado)
+    return time.perf_counter() - inicio, resultado
+
+
+def memoria_mb(bloco: BlocoLancamentos) -> float:
+    """Memória dos arrays do bloco (as constantes são compartilhadas)."""
+    return (bloco.cpfs.nbytes + bloco.valores.nbytes) / 1e6
+
+
+def main():
+    print(
+        f"{'CPFs':>10} {'antigo (s)':>12} {'colunar (s)':>12} {'µs/CPF':>10}"
+        f" {'MB':>8}"
+    )
+    for total in TAMANHOS:
+        df_agrupado = gerar_agrupado(total)
+        antigo = (
+            f"{medir(laco_antigo, df_agrupado)[0]:12.3f}"
+            if total <= LIMITE_LACO_ANTIGO
+            else f"{'-':>12}"
+        )
+        colunar, bloco = medir(montador_colunar, df_agrupado)
+        print(
+            f"{total:>10} {antigo} {colunar:12.3f} {colunar / total * 1e6:10.2f}"
+            f" {memoria_mb(bloco):8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark da leitura das planilhas de entrada.
+
+Gera uma planilha sintética no formato do RF (com colunas extras que não são
+usadas) e mede a leitura completa com o openpyxl contra a leitura com
+projeção de colunas em cada motor disponível.
+
+Uso (a partir de ``src``): ``python -m benchmarks.leitura [linhas ...]``
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+import xlsxwriter
+
+from utils.leitura import MOTORES_AUTOMATICOS, ler_planilha, motor_disponivel
+
+TAMANHOS = [100_000, 1_000_000]
+CABECALHO = [
+    "DATA",
+    "UNIDADE",
+    "NOME",
+    "CPF",
+    "CPF_TITULAR",
+    "PRODUTO",
+    "QUANTIDADE",
+    "ValorTotalProduto",
+]
+COLUNAS_USADAS = ["CPF", "CPF_TITULAR", "ValorTotalProduto"]
+
+
+def gerar_planilha(caminho, linhas):
+    workbook = xlsxwriter.Workbook(caminho, {"constant_memory": True})
+    planilha = workbook.add_worksheet()
+    planilha.write_row(0, 0, CABECALHO)
+    for i in range(1, linhas + 1):
+        cpf = f"{(i * 7919) % 10**11:011d}"
+        titular = f"{(i * 104729) % 10**11:011d}" if i % 4 == 0 else None
+        planilha.write_row(
+            i,
+            0,
+            [
+                "2024-03-15",
+                "SESC",
+                f"CLIENTE {i}",
+                cpf,
+                titular,
+                "REFEICAO",
+                1 + i % 3,
+                (i % 5000) / 100,
+            ],
+        )
+    workbook.close()
+
+
+def medir(funcao):
+    inicio = time.perf_counter()
+    funcao()
+    return time.perf_counter() - inicio
+
+
+def main(tamanhos):
+    motores = [motor for motor in MOTORES_AUTOMATICOS if motor_disponivel(motor)]
+    with tempfile.TemporaryDirectory() as pasta:
+        for linhas in tamanhos:
+            caminho = os.path.join(pasta, f"RF_{linhas}.xlsx")
+            gerar_planilha(caminho, linhas)
+            print(f"\n{linhas} linhas ({os.path.getsize(caminho) / 1e6:.1f} MB)")
+
+            tempo = medir(lambda: pd.read_excel(caminho, dtype=str))
+            print(f"  {'openpyxl, todas as colunas':<32} {tempo:8.2f} s")
+            for motor in motores:
+                tempo = medir(
+                    lambda: ler_planilha(
+                        caminho, COLUNAS_USADAS, dtype=str, motor=motor
+                    )
+                )
+                print(f"  {motor + ', só colunas usadas':<32} {tempo:8.2f} s")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or TAMANHOS)
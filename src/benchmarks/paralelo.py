@@ -0,0 +1,87 @@
+"""Benchmark da troca pelo titular e soma por CPF, em série e em paralelo.
+
+Mede o caminho em série (``resolver_titulares`` e a soma do pipeline) e o de
+``agrupar_em_paralelo`` com 1, 2, 4... processos, até o número de CPUs, e
+confere que as somas são iguais. Com 1 processo, a diferença para o caminho
+em série é o custo fixo do paralelo (pool, memória compartilhada, junção);
+rode na máquina de produção para calibrar ``AGRUPAMENTO_PARALELO``.
+
+Uso (a partir de ``src``): ``python -m benchmarks.paralelo [--tamanhos ...]``
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from processamento.agrupamento import ORDEM_PRIMEIRA_OCORRENCIA
+from processamento.esquema import CPF, CPF_TITULAR, VALOR
+from processamento.paralelo import agrupar_em_paralelo
+from processamento.pipeline import _somar_por_cpf
+from processamento.titulares import resolver_titulares
+from utils.cpf import completar_cpfs
+from utils.helpers import FRACOES_POR_CENTAVO
+
+TAMANHOS = [500_000, 2_000_000, 5_000_000]
+FRACAO_TITULARES = 0.3
+LINHAS_POR_CPF = 3
+
+
+def gerar_entrada(total: int) -> pd.DataFrame:
+    """Entrada já no esquema tipado, como sai de ``tipar_entrada``."""
+    gerador = np.random.default_rng(0)
+    universo = completar_cpfs(gerador.integers(10**7, 10**9, total // LINHAS_POR_CPF))
+    com_titular = gerador.random(total) < FRACAO_TITULARES
+    centavos = gerador.integers(1, 50_000, total)
+    return pd.DataFrame(
+        {
+            CPF: pd.array(gerador.choice(universo, total), dtype="Int64"),
+            CPF_TITULAR: pd.Series(gerador.choice(universo, total))
+            .astype("Int64")
+            .where(com_titular),
+            VALOR: pd.array(centavos * FRACOES_POR_CENTAVO, dtype="Int64"),
+        }
+    )
+
+
+def em_serie(df: pd.DataFrame) -> pd.DataFrame:
+    resolvidos = resolver_titulares(df).cpfs
+    return _somar_por_cpf(df.assign(**{CPF: resolvidos}), ORDEM_PRIMEIRA_OCORRENCIA)
+
+
+def medir(funcao, *argumentos):
+    inicio = time.perf_counter()
+    resultado = funcao(*argumentos)
+    return time.perf_counter() - inicio, resultado
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=TAMANHOS)
+    args = parser.parse_args(argv)
+
+    processos = [1]
+    while processos[-1] * 2 <= (os.cpu_count() or 1):
+        processos.append(processos[-1] * 2)
+    print(f"CPUs: {os.cpu_count()}")
+    print(
+        f"{'linhas':>10} {'série (s)':>10}"
+        + "".join(f" {f'{p}p (s)':>11}" for p in processos)
+    )
+    for total in args.tamanhos:
+        df = gerar_entrada(total)
+        serie, esperado = medir(em_serie, df)
+        tempos = []
+        for quantidade in processos:
+            segundos, (agrupado, _) = medir(
+                agrupar_em_paralelo, df, ORDEM_PRIMEIRA_OCORRENCIA, False, quantidade
+            )
+            assert agrupado[VALOR].tolist() == esperado[VALOR].tolist()
+            tempos.append(segundos)
+        print(f"{total:>10} {serie:10.2f}" + "".join(f" {t:11.2f}" for t in tempos))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""Benchmark de ponta a ponta do processamento de ME, OD e RF, etapa por etapa.
+
+Gera (uma vez) entradas sintéticas com ``benchmarks.sinteticos``, roda o
+processador de cada área e registra o tempo total e o de cada etapa medida
+pelo ``processamento.perfil``. O cache de entradas em Feather é apagado antes
+de cada repetição, para que a leitura do xlsx seja sempre medida.
+
+Os resultados podem ser salvos como base local e comparados depois, sem
+depender de rede::
+
+    python -m benchmarks.pipeline --salvar-base antes
+    (mudanças no código)
+    python -m benchmarks.pipeline --comparar antes
+
+Uso (a partir de ``src``):
+``python -m benchmarks.pipeline [--tamanhos 1000 100000] [--areas ME RF]``
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from benchmarks.sinteticos import FRACAO_TITULARES, planilha_em_cache
+from processamento.cache import caminhos_cache_entrada
+from processamento.contexto import criar_contexto
+from processamento.execucao import PROCESSADORES, REGRAS
+from processamento.perfil import perfilar
+from utils.log import fechar_logs
+
+TAMANHOS = [1_000, 10_000, 100_000]
+REPETICOES = 3
+PASTA_BASES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bases")
+# Razão atual/base acima da qual uma medição conta como regressão; tempos
+# abaixo de MINIMO_SEGUNDOS são ruído e não são comparados.
+LIMITE_REGRESSAO = 1.2
+MINIMO_SEGUNDOS = 0.05
+
+# Colunas de valor e variantes medidas em cada área; áreas fora daqui usam a
+# primeira coluna aceita pela regra, com duas casas.
+VARIANTES = {
+    "ME": [("VALOR", "duas_casas")],
+    "OD": [("VALOR", "duas_casas"), ("VALOR_TOTAL", "tres_casas")],
+    "RF": [("ValorTotalProduto", "duas_casas"), ("VALOR", "duas_casas")],
+}
+
+
+def medir_cenario(
+    tipo, linhas, coluna_valor, variante_valor, fracao_titulares, repeticoes
+) -> dict:
+    """Roda o processador ``repeticoes`` vezes e guarda a melhor execução."""
+    regra = REGRAS[tipo]
+    caminho = planilha_em_cache(
+        tipo, linhas, fracao_titulares, coluna_valor, variante_valor
+    )
+    processar = PROCESSADORES[regra.arquivo]
+    contexto = criar_contexto("202403")
+    melhor = None
+    with tempfile.TemporaryDirectory() as pasta:
+        for _ in range(repeticoes):
+            for cache in caminhos_cache_entrada(caminho):
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(cache)
+            saida = os.path.join(pasta, f"{tipo}.xlsx")
+            log = os.path.join(pasta, f"log_{tipo}.txt")
+            with (
+                perfilar(memoria=False) as perfil,
+                contextlib.redirect_stdout(io.StringIO()),
+            ):
+                inicio = time.perf_counter()
+                processar(caminho, saida, "AL 123", log, contexto)
+                segundos = time.perf_counter() - inicio
+                fechar_logs()
+            if melhor is None or segundos < melhor["segundos"]:
+                melhor = {
+                    "segundos": round(segundos, 4),
+                    "etapas": {
+                        medicao.nome: round(medicao.segundos, 4)
+                        for medicao in perfil.etapas
+                    },
+                }
+    return melhor
+
+
+def executar(tamanhos, areas, repeticoes, fracao_titulares) -> dict:
+    resultados = {}
+    for linhas in tamanhos:
+        for tipo in areas:
+            for coluna_valor, variante_valor in VARIANTES.get(
+                tipo, [(REGRAS[tipo].colunas_valor[0], "duas_casas")]
+            ):
+                chave = f"{tipo}/{linhas}/{coluna_valor}/{variante_valor}"
+                resultado = medir_cenario(
+                    tipo,
+                    linhas,
+                    coluna_valor,
+                    variante_valor,
+                    fracao_titulares,
+                    repeticoes,
+                )
+                resultados[chave] = resultado
+                etapas = "  ".join(
+                    f"{nome} {segundos:.3f}"
+                    for nome, segundos in resultado["etapas"].items()
+                )
+                print(f"{chave:<42} {resultado['segundos']:8.3f} s   {etapas}")
+    return resultados
+
+
+def caminho_base(nome) -> str:
+    return os.path.join(PASTA_BASES, f"{nome}.json")
+
+
+def salvar_base(nome, resultados, repeticoes):
+    os.makedirs(PASTA_BASES, exist_ok=True)
+    base = {
+        "criado": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "plataforma": platform.platform(),
+        "repeticoes": repeticoes,
+        "resultados": resultados,
+    }
+    with open(caminho_base(nome), "w", encoding="utf-8") as arquivo:
+        json.dump(base, arquivo, ensure_ascii=False, indent=2)
+    print(f"\nBase salva em {caminho_base(nome)}")
+
+
+def comparar(nome, resultados, limite=LIMITE_REGRESSAO) -> list[str]:
+    """Compara com a base ``nome``; retorna as medições que regrediram."""
+    with open(caminho_base(nome), encoding="utf-8") as arquivo:
+        base = json.load(arquivo)["resultados"]
+
+    regressoes = []
+    print(f"\n{'cenário / etapa':<54} {'base':>8} {'atual':>8} {'razão':>7}")
+    for chave, atual in resultados.items():
+        anterior = base.get(chave)
+        if anterior is None:
+            continue
+        medicoes = [(chave, anterior["segundos"], atual["segundos"])]
+        medicoes += [
+            (f"  {etapa}", anterior["etapas"][etapa], segundos)
+            for etapa, segundos in atual["etapas"].items()
+            if etapa in anterior["etapas"]
+        ]
+        for rotulo, antes, depois in medicoes:
+            razao = depois / antes if antes else float("inf")
+            regrediu = razao > limite and max(antes, depois) >= MINIMO_SEGUNDOS
+            marca = "  ⚠️ regressão" if regrediu else ""
+            print(f"{rotulo:<54} {antes:8.3f} {depois:8.3f} {razao:7.2f}{marca}")
+            if regrediu:
+                regressoes.append(
+                    chave if rotulo == chave else f"{chave} {rotulo.strip()}"
+                )
+    return regressoes
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=TAMANHOS)
+    parser.add_argument("--areas", nargs="+", default=list(REGRAS))
+    parser.add_argument("--repeticoes", type=int, default=REPETICOES)
+    parser.add_argument("--titulares", type=float, default=FRACAO_TITULARES)
+    parser.add_argument("--salvar-base", metavar="NOME")
+    parser.add_argument("--comparar", metavar="NOME")
+    parser.add_argument("--limite", type=float, default=LIMITE_REGRESSAO)
+    args = parser.parse_args(argv)
+
+    desconhecidas = set(args.areas) - set(REGRAS)
+    if desconhecidas:
+        parser.error(f"áreas desconhecidas: {', '.join(sorted(desconhecidas))}")
+
+    resultados = executar(args.tamanhos, args.areas, args.repeticoes, args.titulares)
+    if args.salvar_base:
+        salvar_base(args.salvar_base, resultados, args.repeticoes)
+    if args.comparar:
+        regressoes = comparar(args.comparar, resultados, args.limite)
+        if regressoes:
+            print(
+                f"\n{len(regressoes)} medição(ões) acima de {args.limite:.2f}x da base"
+            )
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
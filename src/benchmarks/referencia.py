@@ -0,0 +1,71 @@
+"""Gera as saídas de referência usadas por ``tests/test_referencia.py``.
+
+Para cada área e variante de valor, grava em ``tests/referencia/<TIPO>_<variante>``
+uma entrada sintética pequena (``<TIPO>.xlsx``) e a saída que a implementação
+``--referencia`` gera para ela (``esperado.xlsx``), com o mesmo código AL e mês
+de ``benchmarks.equivalencia``. O teste roda a árvore atual sobre as mesmas
+entradas e compara célula a célula: uma edição em ``REGRAS_AREAS`` que mude a
+saída aparece ali.
+
+As referências gravadas vieram de ``git:626e22c``, a primeira revisão, com os
+processadores originais de cada área. Só regenere com outra revisão quando a
+mudança na saída for intencional.
+
+Uso (a partir de ``src``)::
+
+    python -m benchmarks.referencia --referencia git:626e22c
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+
+from benchmarks.equivalencia import (
+    RAIZ_REPOSITORIO,
+    TIPOS,
+    executar_implementacao,
+    preparar_implementacao,
+)
+from benchmarks.sinteticos import VARIANTES_VALOR, gerar_planilha
+from processamento.execucao import REGRAS
+
+PASTA_REFERENCIA = os.path.join(RAIZ_REPOSITORIO, "tests", "referencia")
+LINHAS = 1_000
+SEMENTE = 0
+ESPERADO = "esperado.xlsx"
+
+
+def casos() -> list[tuple[str, str]]:
+    """``(tipo, pasta)`` de cada referência gravada."""
+    return [
+        (tipo, os.path.join(PASTA_REFERENCIA, f"{tipo}_{variante}"))
+        for tipo in TIPOS
+        for variante in VARIANTES_VALOR
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--referencia", required=True)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as temporaria:
+        src = preparar_implementacao(args.referencia, os.path.join(temporaria, "ref"))
+        for tipo, pasta in casos():
+            regra = REGRAS[tipo]
+            variante = os.path.basename(pasta).removeprefix(f"{tipo}_")
+            os.makedirs(pasta, exist_ok=True)
+            entrada = os.path.join(pasta, regra.arquivo)
+            gerar_planilha(
+                entrada, regra, LINHAS, variante_valor=variante, semente=SEMENTE
+            )
+            saida = executar_implementacao(
+                src, tipo, entrada, os.path.join(temporaria, os.path.basename(pasta))
+            )
+            shutil.copyfile(saida, os.path.join(pasta, ESPERADO))
+            print(os.path.join(pasta, ESPERADO))
+
+
+if __name__ == "__main__":
+    main()
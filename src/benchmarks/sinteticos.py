@@ -0,0 +1,151 @@
+"""Geradores de planilhas sintéticas de ME, OD e RF para os benchmarks.
+
+As planilhas seguem a regra da área em ``config.REGRAS_AREAS``: colunas de
+valor aceitas, coluna de CPF com outra grafia quando a regra permite e linha
+de total no fim quando a regra a descarta. Os CPFs têm dígitos verificadores
+válidos e cada um aparece em média ``linhas_por_cpf`` vezes; uma fração das
+linhas traz CPF_TITULAR e algumas vêm sem valor, como nas exportações reais.
+
+Uso (a partir de ``src``):
+``python -m benchmarks.sinteticos PASTA [linhas] [--titulares 0.3]``
+"""
+
+import argparse
+import os
+import tempfile
+
+import numpy as np
+import xlsxwriter
+
+from processamento.execucao import REGRAS
+from utils.cpf import completar_cpfs
+
+PASTA_PADRAO = os.path.join(tempfile.gettempdir(), "al_sesc_benchmarks")
+FRACAO_TITULARES = 0.3
+FRACAO_SEM_VALOR = 0.01
+LINHAS_POR_CPF = 3
+# Valores com três casas exercitam o arredondamento só no total do CPF.
+VARIANTES_VALOR = ("duas_casas", "tres_casas")
+# Entra no nome das planilhas em cache: mude ao alterar o que é gerado.
+VERSAO_GERADOR = 2
+
+
+def _coluna_cpf(regra) -> str:
+    return "Cpf" if regra.cpf_sem_maiusculas else "CPF"
+
+
+def gerar_planilha(
+    caminho,
+    regra,
+    linhas,
+    fracao_titulares=FRACAO_TITULARES,
+    coluna_valor=None,
+    variante_valor="duas_casas",
+    linhas_por_cpf=LINHAS_POR_CPF,
+    semente=0,
+):
+    """Grava uma entrada sintética de ``linhas`` linhas para ``regra``.
+
+    ``coluna_valor`` escolhe entre as colunas aceitas pela regra (padrão: a
+    primeira) e ``variante_valor`` entre ``VARIANTES_VALOR``.
+    """
+    coluna_valor = coluna_valor or regra.colunas_valor[0]
+    if coluna_valor not in regra.colunas_valor:
+        raise ValueError(f"{regra.tipo} não aceita a coluna {coluna_valor!r}")
+    if variante_valor not in VARIANTES_VALOR:
+        raise ValueError(f"Variante de valor desconhecida: {variante_valor!r}")
+
+    gerador = np.random.default_rng(semente)
+    distintos = max(linhas // linhas_por_cpf, 1)
+    universo = completar_cpfs(gerador.integers(10**7, 10**9, distintos))
+    cpfs = gerador.choice(universo, linhas)
+    com_titular = gerador.random(linhas) < fracao_titulares
+    titulares = gerador.choice(universo, linhas)
+    if variante_valor == "tres_casas":
+        valores = gerador.integers(1, 500_000, linhas) / 1000
+    else:
+        valores = gerador.integers(1, 50_000, linhas) / 100
+    sem_valor = gerador.random(linhas) < FRACAO_SEM_VALOR
+
+    workbook = xlsxwriter.Workbook(caminho, {"constant_memory": True})
+    planilha = workbook.add_worksheet()
+    planilha.write_row(
+        0, 0, ["NOME", _coluna_cpf(regra), "CPF_TITULAR", "PRODUTO", coluna_valor]
+    )
+    for i in range(linhas):
+        linha = i + 1
+        planilha.write_string(linha, 0, f"CLIENTE {i}")
+        planilha.write_string(linha, 1, f"{cpfs[i]:011d}")
+        if com_titular[i]:
+            planilha.write_string(linha, 2, f"{titulares[i]:011d}")
+        planilha.write_string(linha, 3, regra.area)
+        if not sem_valor[i]:
+            planilha.write_number(linha, 4, valores[i])
+    if regra.remover_ultima_linha:
+        planilha.write_string(linhas + 1, 0, "TOTAL")
+        planilha.write_number(linhas + 1, 4, round(float(valores[~sem_valor].sum()), 2))
+    workbook.close()
+
+
+def planilha_em_cache(
+    tipo,
+    linhas,
+    fracao_titulares=FRACAO_TITULARES,
+    coluna_valor=None,
+    variante_valor="duas_casas",
+    semente=0,
+    pasta=PASTA_PADRAO,
+) -> str:
+    """Caminho de uma entrada sintética, gerada só na primeira vez.
+
+    Cada combinação de parâmetros fica em sua própria pasta, com o arquivo no
+    nome esperado pelo processamento (``ME.xlsx`` etc.).
+    """
+    regra = REGRAS[tipo]
+    coluna_valor = coluna_valor or regra.colunas_valor[0]
+    nome = (
+        f"{tipo}_{linhas}_{coluna_valor}_{variante_valor}"
+        f"_{fracao_titulares:g}_{semente}_v{VERSAO_GERADOR}"
+    )
+    caminho = os.path.join(pasta, nome, regra.arquivo)
+    if not os.path.exists(caminho):
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        temporario = os.path.join(os.path.dirname(caminho), f"~{regra.arquivo}")
+        gerar_planilha(
+            temporario,
+            regra,
+            linhas,
+            fracao_titulares,
+            coluna_valor,
+            variante_valor,
+            semente=semente,
+        )
+        os.replace(temporario, caminho)
+    return caminho
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pasta")
+    parser.add_argument("linhas", type=int, nargs="?", default=10_000)
+    parser.add_argument("--titulares", type=float, default=FRACAO_TITULARES)
+    parser.add_argument("--valores", choices=VARIANTES_VALOR, default="duas_casas")
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args()
+
+    os.makedirs(args.pasta, exist_ok=True)
+    for regra in REGRAS.values():
+        caminho = os.path.join(args.pasta, regra.arquivo)
+        gerar_planilha(
+            caminho,
+            regra,
+            args.linhas,
+            args.titulares,
+            variante_valor=args.valores,
+            semente=args.semente,
+        )
+        print(f"{caminho} ({os.path.getsize(caminho) / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark da troca de CPF pelo CPF do titular.
+
+Compara o ``apply(axis=1)`` antigo (ME/OD) e o ``iterrows`` antigo (RF) com o
+resolvedor em colunas. Os laços antigos só rodam até ``LIMITE_LACO_ANTIGO``
+linhas; acima disso, o tempo deles cresce linearmente e não vale esperar.
+
+Uso (a partir de ``src``): ``python -m benchmarks.titulares``
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from processamento.titulares import resolver_titulares
+
+TAMANHOS = [10_000, 100_000, 1_000_000]
+LIMITE_LACO_ANTIGO = 100_000
+FRACAO_DEPENDENTES = 0.3
+
+
+def gerar_entrada(total: int) -> pd.DataFrame:
+    gerador = np.random.default_rng(42)
+    cpfs = pd.Series(np.arange(total).astype(str)).str.zfill(11)
+    titulares = cpfs.where(gerador.random(total) >= FRACAO_DEPENDENTES, None)
+    titulares = titulares.where(titulares.isna(), titulares.str[::-1])
+    return pd.DataFrame({"CPF": cpfs, "CPF_TITULAR": titulares})
+
+
+def apply_antigo(df: pd.DataFrame) -> pd.Series:
+    return df.apply(
+        lambda row: (
+            row["CPF_TITULAR"]
+            if pd.notnull(row["CPF_TITULAR"]) and row["CPF_TITULAR"] != row["CPF"]
+            else row["CPF"]
+        ),
+        axis=1,
+    )
+
+
+def iterrows_antigo(df: pd.DataFrame) -> pd.Series:
+    df = df.copy()
+    for i, row in df.iterrows():
+        cpf_titular = row.get("CPF_TITULAR")
+        if pd.notna(cpf_titular):
+            df.at[i, "CPF"] = str(cpf_titular)
+    return df["CPF"]
+
+
+def resolvedor(df: pd.DataFrame) -> pd.Series:
+    return resolver_titulares(df, somente_se_diferente=True, tamanho_amostra=5).cpfs
+
+
+def medir(funcao, df: pd.DataFrame) -> tuple[float, pd.Series]:
+    inicio = time.perf_counter()
+    resultado = funcao(df)
+    return time.perf_counter() - inicio, resultado
+
+
+def main():
+    print(
+        f"{'linhas':>10} {'apply (s)':>12} {'iterrows (s)':>13} "
+        f"{'colunas (s)':>12} {'ns/linha':>10}"
+    )
+    for total in TAMANHOS:
+        df = gerar_entrada(total)
+        colunas, esperado = medir(resolvedor, df)
+        antigos = []
+        for funcao in (apply_antigo, iterrows_antigo):
+            if total > LIMITE_LACO_ANTIGO:
+                antigos.append("-")
+                continue
+            segundos, resultado = medir(funcao, df)
+            assert resultado.equals(esperado), funcao.__name__
+            antigos.append(f"{segundos:.3f}")
+        print(
+            f"{total:>10} {antigos[0]:>12} {antigos[1]:>13} "
+            f"{colunas:12.3f} {colunas / total * 1e9:10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""Execução em lote, sem interface gráfica.
+
+Exemplo::
+
+    python cli.py --entrada /dados/2024-03 --mes 202403 --al ME=123 --al OD=456 --al RF=789
+
+Os módulos de processamento (pandas) só são importados depois da leitura dos
+argumentos, e os da interface (Tk) apenas se faltar algum código AL e a
+execução não for ``--sem-gui``.
+
+Códigos de saída: 0 sucesso, 1 algum arquivo falhou ou não foi gerado,
+2 argumentos inválidos ou nenhum arquivo de entrada, 130 interrompido.
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+
+from utils.validacao import normalizar_codigo_al, validar_ano_mes
+
+SAIDA_OK = 0
+SAIDA_FALHA = 1
+SAIDA_USO = 2
+SAIDA_INTERROMPIDO = 130
+
+
+def criar_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="al-sesc-mxm",
+        description="Gera as planilhas de importação MXM a partir de ME, OD e RF.",
+    )
+    parser.add_argument(
+        "--entrada",
+        default=os.getcwd(),
+        help="pasta com ME.xlsx, OD.xlsx e RF.xlsx (padrão: pasta atual)",
+    )
+    parser.add_argument(
+        "--saida",
+        help="pasta dos arquivos gerados (padrão: <entrada>/arquivos_importacao)",
+    )
+    parser.add_argument("--logs", help="pasta dos logs (padrão: <entrada>/logs)")
+    parser.add_argument(
+        "--mes",
+        type=_tipo_ano_mes,
+        help="mês de referência AAAAMM (padrão: mês anterior ao atual)",
+    )
+    parser.add_argument(
+        "--al",
+        action="append",
+        default=[],
+        metavar="[ARQ=]CODIGO",
+        help="código AL por arquivo (ex.: ME=123) ou, sem ARQ=, para todos",
+    )
+    parser.add_argument(
+        "--sequencial",
+        action="store_true",
+        help="processa um arquivo por vez em vez de usar um processo por arquivo",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="máximo de arquivos processados ao mesmo tempo (padrão: nº de CPUs)",
+    )
+    parser.add_argument(
+        "--pasta-de-trabalho",
+        metavar="XLSX",
+        help="um único xlsx com ME, OD e RF em abas, lido numa só abertura (ignora "
+        "--entrada; sempre reprocessa tudo, num só processo)",
+    )
+    parser.add_argument(
+        "--saida-unica",
+        action="store_true",
+        help="grava as planilhas de importação como abas de um só xlsx "
+        "(IMPORTACAO<AAAAMM>.xlsx); sempre reprocessa tudo, num só processo",
+    )
+    parser.add_argument(
+        "--formato",
+        choices=("xlsx", "csv", "txt"),
+        help="formato das planilhas de importação: xlsx, csv (delimitado) ou txt "
+        "(largura fixa) (padrão: FORMATO_SAIDA do config.py)",
+    )
+    parser.add_argument(
+        "--lote",
+        metavar="RAIZ",
+        help="processa todas as pastas RAIZ/<unidade>/<AAAAMM> (ignora --entrada e --mes)",
+    )
+    parser.add_argument(
+        "--manifesto",
+        help="JSON com os códigos AL do lote (padrão: RAIZ/manifesto.json)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="reprocessa mesmo os arquivos que não mudaram desde a última execução",
+    )
+    parser.add_argument(
+        "--cprofile",
+        action="store_true",
+        help="grava também um perfil do cProfile por arquivo (<log>_perfil.prof)",
+    )
+    parser.add_argument(
+        "--sem-gui",
+        action="store_true",
+        help="nunca abre janelas; falta de código AL vira erro",
+    )
+    return parser
+
+
+def _tipo_ano_mes(valor):
+    try:
+        return validar_ano_mes(valor)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def interpretar_codigos_al(valores) -> dict:
+    """Converte ``["ME=123", "456"]`` em ``{"ME": "AL 123", "*": "AL 456"}``."""
+    codigos = {}
+    for valor in valores:
+        arquivo, separador, codigo = valor.partition("=")
+        if not separador:
+            arquivo, codigo = "*", valor
+        arquivo = arquivo.strip().upper().removesuffix(".XLSX")
+        codigo = normalizar_codigo_al(codigo)
+        if not codigo:
+            raise ValueError(f"Código AL vazio em --al {valor!r}")
+        codigos[arquivo] = codigo
+    return codigos
+
+
+def main(argv=None) -> int:
+    parser = criar_parser()
+    args = parser.parse_args(argv)
+
+    try:
+        codigos = interpretar_codigos_al(args.al)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.lote:
+        return executar_modo_lote(args)
+    carga_unica = args.pasta_de_trabalho or args.saida_unica
+    if carga_unica and (args.workers is not None or args.cprofile):
+        parser.error(
+            "--workers e --cprofile não se aplicam a --pasta-de-trabalho nem a "
+            "--saida-unica, que processam tudo num só processo"
+        )
+
+    pasta_entrada = args.entrada
+    if args.pasta_de_trabalho:
+        if not os.path.isfile(args.pasta_de_trabalho):
+            print(
+                f"⚠️ Pasta de trabalho não encontrada: {args.pasta_de_trabalho}",
+                file=sys.stderr,
+            )
+            return SAIDA_USO
+        pasta_entrada = os.path.dirname(os.path.abspath(args.pasta_de_trabalho))
+    elif not os.path.isdir(pasta_entrada):
+        print(f"⚠️ Pasta de entrada inválida: {pasta_entrada}", file=sys.stderr)
+        return SAIDA_USO
+    pasta_saida = args.saida or os.path.join(pasta_entrada, "arquivos_importacao")
+    pasta_logs = args.logs or os.path.join(pasta_entrada, "logs")
+    os.makedirs(pasta_saida, exist_ok=True)
+    os.makedirs(pasta_logs, exist_ok=True)
+
+    def obter_codigo_al(arquivo):
+        codigo = codigos.get(os.path.splitext(arquivo)[0].upper(), codigos.get("*"))
+        if codigo or args.sem_gui:
+            return codigo
+        from utils.dialogos import pedir_codigo_al
+
+        return pedir_codigo_al(arquivo)
+
+    from processamento.execucao import (
+        executar_carga_unica,
+        executar_tarefas,
+        montar_tarefas,
+        montar_tarefas_pasta_de_trabalho,
+    )
+    from utils.log import escrever_no_log, fechar_logs
+
+    if args.pasta_de_trabalho:
+        tarefas = montar_tarefas_pasta_de_trabalho(
+            args.pasta_de_trabalho,
+            pasta_saida,
+            pasta_logs,
+            obter_codigo_al,
+            args.mes,
+            saida_unica=args.saida_unica,
+            formato=args.formato,
+        )
+    else:
+        tarefas = montar_tarefas(
+            pasta_entrada,
+            pasta_saida,
+            pasta_logs,
+            obter_codigo_al,
+            args.mes,
+            saida_unica=args.saida_unica,
+            formato=args.formato,
+        )
+    if not tarefas:
+        print("⚠️ Nenhum arquivo de entrada encontrado.", file=sys.stderr)
+        return SAIDA_USO
+    sem_codigo = [tarefa.arquivo for tarefa in tarefas if not tarefa.codigo_al]
+    if sem_codigo:
+        print(
+            f"⚠️ Código AL não informado para: {', '.join(sem_codigo)}", file=sys.stderr
+        )
+        return SAIDA_USO
+
+    caminho_erros = os.path.join(pasta_logs, "erros_processamento.txt")
+    codigo_saida = SAIDA_OK
+    if carga_unica:
+        # Sempre reprocessa, num só processo: --force e --sequencial já valem.
+        resultados = executar_carga_unica(tarefas, args.saida_unica)
+    else:
+        resultados = executar_tarefas(
+            tarefas,
+            paralelo=not args.sequencial,
+            max_workers=args.workers,
+            forcar=args.force,
+            cprofile=args.cprofile,
+        )
+    for resultado in resultados:
+        tarefa = resultado.tarefa
+        if resultado.erro is not None:
+            escrever_no_log(
+                f"⚠️ Erro ao processar {tarefa.arquivo}: {resultado.erro}",
+                caminho_erros,
+                "ERRO",
+            )
+            codigo_saida = SAIDA_FALHA
+        elif not resultado.gerado:
+            escrever_no_log(
+                f"⚠️ {tarefa.arquivo} não gerou saída; veja {tarefa.caminho_log}",
+                caminho_erros,
+                "AVISO",
+            )
+            codigo_saida = SAIDA_FALHA
+        elif not resultado.reaproveitado:
+            escrever_no_log(
+                f"🆗 Processamento concluído para {tarefa.arquivo}.", tarefa.caminho_log
+            )
+    fechar_logs()
+    return codigo_saida
+
+
+def executar_modo_lote(args) -> int:
+    if not os.path.isdir(args.lote):
+        print(f"⚠️ Pasta do lote inválida: {args.lote}", file=sys.stderr)
+        return SAIDA_USO
+    caminho_manifesto = args.manifesto or os.path.join(args.lote, "manifesto.json")
+    if not os.path.isfile(caminho_manifesto):
+        print(f"⚠️ Manifesto não encontrado: {caminho_manifesto}", file=sys.stderr)
+        return SAIDA_USO
+
+    from processamento.lote import carregar_manifesto, executar_lote
+
+    manifesto = carregar_manifesto(caminho_manifesto)
+    max_workers = 1 if args.sequencial else args.workers
+    relatorio = executar_lote(
+        args.lote,
+        manifesto,
+        max_workers=max_workers,
+        forcar=args.force,
+        cprofile=args.cprofile,
+        formato=args.formato,
+    )
+
+    resumo = ", ".join(
+        f"{status}: {total}" for status, total in relatorio["resumo"].items()
+    )
+    print(
+        f"📊 Lote concluído em {relatorio['duracao_segundos']:.1f} s ({resumo or 'nada a processar'})"
+    )
+    print(f"📄 Relatório: {relatorio['caminho']}")
+    if not relatorio["jobs"]:
+        return SAIDA_USO
+    if any(job["status"] not in ("ok", "reaproveitado") for job in relatorio["jobs"]):
+        return SAIDA_FALHA
+    return SAIDA_OK
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        print("\n❌ Processamento interrompido pelo usuário.")
+        sys.exit(SAIDA_INTERROMPIDO)
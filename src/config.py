@@ -24,3 +24,165 @@ TEMPLATE_IMPORTACAO_BASE = {
     "CONVERTER MOEDA": "N",
     "EXCLUIR LANÇAMENTOS": "N",
 }
+
+LOG_CONFIG = {
+    "nivel": "INFO",
+    "eco_console": True,
+    "intervalo_flush": 100,
+    "intervalo_segundos": 2.0,
+    "detalhes": False,
+}
+
+# "auto" usa o calamine se estiver instalado e cai para o openpyxl.
+MOTOR_LEITURA = "auto"
+
+# Planilhas com mais de "limite_mb" MB são lidas em blocos de
+# "linhas_por_bloco" linhas e somadas por CPF à medida que são lidas, sem
+# carregar a planilha inteira na memória (nem passar pelo cache de entradas).
+# None em "limite_mb" desliga a leitura em blocos.
+# É uma troca de tempo por memória: os blocos vêm do openpyxl em modo
+# read-only, bem mais lento que o calamine da leitura completa. Em 1 milhão
+# de linhas do RF (33 MB de xlsx), 142 s em blocos contra 59 s, com pico de
+# memória de 308 MB contra 998 MB. Por isso o limite é alto: 100 MB de xlsx
+# são cerca de 3 milhões de linhas e perto de 3 GB na leitura completa. Com
+# memória de sobra, aumente "limite_mb" ou use None.
+LEITURA_EM_BLOCOS = {"limite_mb": 100, "linhas_por_bloco": 100_000}
+
+# Entradas com pelo menos "min_linhas" linhas têm a troca pelo titular e a
+# soma por CPF divididas em fatias entre "processos" processos (None: um por
+# CPU). None em "min_linhas" desliga.
+# O ganho com vários núcleos NÃO foi medido: a máquina de desenvolvimento tem
+# uma CPU só. Nela (python -m benchmarks.paralelo), 2 milhões de linhas levam
+# 0,46 s em série e 0,90 s no caminho paralelo com 1 processo: o paralelo
+# custa cerca de 0,1 s fixo (pool e memória compartilhada) e o dobro do
+# trabalho por linha (cópias e a junção). Mesmo dividindo esse trabalho sem
+# perdas, só compensa com 3 núcleos ou mais, e abaixo de 2 milhões de linhas o
+# ganho possível fica em décimos de segundo, perto do custo fixo e muito
+# menor que a leitura do xlsx. Com 1 ou 2 núcleos, prefira None em
+# "min_linhas"; meça a máquina de produção antes de baixar o limite.
+AGRUPAMENTO_PARALELO = {"min_linhas": 2_000_000, "processos": None}
+
+# Conferência dos CPFs lidos (CPF e CPF_TITULAR), depois de removida a
+# pontuação e recuperados os zeros à esquerda:
+# - digitos_verificadores: descarta a linha cujo CPF não passa nos dois
+#   dígitos verificadores (ou tem os 11 dígitos iguais); um CPF_TITULAR assim
+#   é ignorado, como um ilegível
+# - relatorio_rejeitados: grava as células descartadas, com o motivo, em
+#   "<log>_rejeitados.csv", ao lado do log da área
+VALIDACAO_CPF = {"digitos_verificadores": True, "relatorio_rejeitados": True}
+
+# Formato das planilhas de importação: "xlsx", "csv" (delimitado) ou "txt"
+# (largura fixa). Os formatos de texto são gravados em streaming, bem mais
+# rápido que o xlsx, e seguem SAIDA_TEXTO.
+FORMATO_SAIDA = "xlsx"
+
+# - larguras: tamanho de cada campo no "txt", na ordem do template; texto é
+#   alinhado à esquerda e números (VALOR, SEQUENCIA) à direita, com espaços
+# - separador_decimal: usado em VALOR, sempre com duas casas
+# - cabecalho_csv: grava os nomes das colunas na primeira linha do "csv"
+SAIDA_TEXTO = {
+    "codificacao": "cp1252",
+    "fim_de_linha": "\r\n",
+    "delimitador": ";",
+    "separador_decimal": ",",
+    "cabecalho_csv": True,
+    "larguras": {
+        "CODIGO DA EMPRESA": 4,
+        "LOTE": 3,
+        "DATA DO LANCAMENTO": 8,
+        "DOCUMENTO": 10,
+        "CONTA CONTABIL": 14,
+        "INDICADOR DE CONTA": 1,
+        "VALOR": 17,
+        "HISTORICO": 200,
+        "BRANCO": 1,
+        "VALOR SEGUNDA MOEDA": 17,
+        "BRANCO2": 1,
+        "CENTRO DE CUSTO": 10,
+        "SEQUENCIA": 6,
+        "PROJETO": 10,
+        "FORNECEDOR": 14,
+        "CLIENTE": 14,
+        "VALOR SEGUNDA MOEDA2": 17,
+        "HIST PADRAO": 5,
+        "HIST. PADRAO - COMPLEMENTO 1": 50,
+        "HIST. PADRAO - COMPLEMENTO 2": 50,
+        "HIST. PADRAO - COMPLEMENTO 3": 50,
+        "NUMERO DO TITULO": 15,
+        "CONVERTER MOEDA": 1,
+        "EXCLUIR LANÇAMENTOS": 1,
+    },
+}
+
+# Regras de cada área. Cada chave é o tipo do arquivo de entrada ("ME" lê
+# ME.xlsx e gera ME<MMAA>.xlsx); para incluir uma área basta uma nova entrada.
+#
+# - colunas_valor: candidatas à coluna de valor, na ordem de preferência
+# - remover_ultima_linha: descarta a linha de total da planilha de origem
+# - cpf_sem_maiusculas: aceita "Cpf", "cpf" etc. como coluna de CPF
+# - exigir_cpf_proprio: descarta linhas sem CPF antes de aplicar o titular
+# - titular_somente_se_diferente: só troca quando o titular difere do CPF
+# - ordem: "primeira_ocorrencia" ou "cpf"
+# - fator_cpf: fração do valor lançada em cada CPF (truncada nos centavos)
+# - ajustar_centavos: distribui os centavos truncados entre os CPFs e fecha a
+#   linha de desconto pela diferença; sem ajuste, o desconto é arredondado
+# - arredondar_soma_cpf: arredonda a soma de cada CPF nos centavos antes de
+#   aplicar fator_cpf (padrão); com False, cada CPF é truncado a partir da sua
+#   soma e o total não é arredondado
+# - linha_desconto: lançamento do restante (1 - fator_cpf), ou None
+# - cliente_no_total: valor da coluna CLIENTE na linha de total
+REGRAS_AREAS = {
+    "ME": {
+        "area": "ESPORTE",
+        "prefixo_historico": "MENSALIDADE ",
+        "colunas_valor": ["VALOR"],
+        "remover_ultima_linha": True,
+        "ordem": "cpf",
+        "fator_cpf": 0.5,
+        "ajustar_centavos": True,
+        "arredondar_soma_cpf": False,
+        "conta_cpf": "11381010101001",
+        "linha_desconto": {
+            "conta": "31321019901001",
+            "centro_custo": "02053",
+            "projeto": "20001",
+        },
+        "conta_total": "21881010101001",
+    },
+    "OD": {
+        "area": "CONSULTAS ODONTOLÓGICAS",
+        "colunas_valor": ["VALOR", "VALOR_TOTAL"],
+        "exigir_cpf_proprio": True,
+        "titular_somente_se_diferente": True,
+        "ordem": "primeira_ocorrencia",
+        "fator_cpf": 0.5,
+        "conta_cpf": "11381010101001",
+        "linha_desconto": {
+            "conta": "31321010301001",
+            "centro_custo": "02050",
+            "projeto": "20001",
+        },
+        "conta_total": "21881010101001",
+    },
+    "RF": {
+        "area": "FORNECIMENTO DE REFEIÇÕES E LANCHES",
+        "colunas_valor": ["VALOR", "VALOR_TOTAL", "ValorTotalProduto"],
+        "remover_ultima_linha": True,
+        "cpf_sem_maiusculas": True,
+        "ordem": "cpf",
+        "fator_cpf": 1,
+        "conta_cpf": "11381010101001",
+        "conta_total": "21881010101001",
+        "cliente_no_total": "",
+    },
+}
+
+# Guarda a entrada já lida e tipada em Feather (".ME.xlsx.entrada.feather"),
+# ao lado da planilha, para reprocessar o mesmo mês sem ler o xlsx de novo.
+# Requer o pyarrow (pip install pyarrow); sem ele, é ignorado.
+CACHE_ENTRADAS = True
+
+# Relatório de tempo e linhas por etapa, gravado a cada execução em
+# "<log>_perfil.json". Com "memoria", inclui o pico de memória de cada etapa
+# (tracemalloc), mas o processamento fica de 2 a 3 vezes mais lento.
+PERFIL_CONFIG = {"relatorio": True, "memoria": False}
@@ -1,50 +1,75 @@
+import multiprocessing
 import os
 import sys
 from pathlib import Path
 
-from processamento.me import processar_me
-from processamento.od import processar_od
-from processamento.rf import processar_rf
-from utils.helpers import ano_mes_anterior, pedir_codigo_al
-from utils.log import escrever_no_log
+from processamento.execucao import (
+    executar_carga_unica,
+    executar_tarefas,
+    montar_tarefas,
+    montar_tarefas_pasta_de_trabalho,
+)
+from utils.dialogos import pedir_codigo_al
+from utils.log import escrever_no_log, fechar_logs
 
 
-def processar_arquivos(pasta_entrada, pasta_saida, pasta_logs):
-    arquivos = ["ME.xlsx", "OD.xlsx", "RF.xlsx"]
-    arquivos_gerados = []
-
-    for arquivo in arquivos:
-        caminho_entrada = os.path.join(pasta_entrada, arquivo)
-        if not os.path.exists(caminho_entrada):
-            continue
+def processar_arquivos(
+    pasta_entrada,
+    pasta_saida,
+    pasta_logs,
+    paralelo=True,
+    forcar=False,
+    pasta_de_trabalho=None,
+    saida_unica=False,
+):
+    """Processa ME, OD e RF de ``pasta_entrada``.
 
-        caminho_saida = os.path.join(
-            pasta_saida, f"{arquivo[:2]}{ano_mes_anterior()}.xlsx"
+    Com ``pasta_de_trabalho`` (um xlsx com as áreas em abas ME, OD e RF), as
+    abas são lidas numa só abertura do arquivo. Com ``saida_unica``, as
+    planilhas de importação são gravadas como abas de um único xlsx. Nos dois
+    casos o processamento roda neste processo, sem cache de saídas.
+    """
+    # Os códigos AL são pedidos antes, para que o processamento possa rodar
+    # sem interação (e em paralelo) depois.
+    if pasta_de_trabalho:
+        tarefas = montar_tarefas_pasta_de_trabalho(
+            pasta_de_trabalho,
+            pasta_saida,
+            pasta_logs,
+            pedir_codigo_al,
+            saida_unica=saida_unica,
         )
-        caminho_log = os.path.join(
+    else:
+        tarefas = montar_tarefas(
+            pasta_entrada,
+            pasta_saida,
             pasta_logs,
-            f"log_processamento_{arquivo[:2].lower()}{ano_mes_anterior()}.txt",
+            pedir_codigo_al,
+            saida_unica=saida_unica,
         )
-        codigo_al = pedir_codigo_al(arquivo)
-
-        try:
-            if arquivo == "ME.xlsx":
-                processar_me(caminho_entrada, caminho_saida, codigo_al, caminho_log)
-            elif arquivo == "OD.xlsx":
-                processar_od(caminho_entrada, caminho_saida, codigo_al, caminho_log)
-            elif arquivo == "RF.xlsx":
-                processar_rf(caminho_entrada, caminho_saida, codigo_al, caminho_log)
-
-            if os.path.exists(caminho_saida):
-                arquivos_gerados.append(caminho_saida)
-
-            escrever_no_log(f"🆗 Processamento concluído para {arquivo}.", caminho_log)
+    if pasta_de_trabalho or saida_unica:
+        resultados = executar_carga_unica(tarefas, saida_unica)
+    else:
+        resultados = executar_tarefas(tarefas, paralelo=paralelo, forcar=forcar)
 
-        except Exception as e:
+    arquivos_gerados = []
+    for resultado in resultados:
+        tarefa = resultado.tarefa
+        if resultado.erro is not None:
             escrever_no_log(
-                f"⚠️ Erro ao processar {arquivo}: {e}",
+                f"⚠️ Erro ao processar {tarefa.arquivo}: {resultado.erro}",
                 os.path.join(pasta_logs, "erros_processamento.txt"),
+                "ERRO",
             )
+            continue
+
+        if resultado.gerado:
+            arquivos_gerados.append(tarefa.caminho_saida)
+
+        escrever_no_log(
+            f"🆗 Processamento concluído para {tarefa.arquivo}.", tarefa.caminho_log
+        )
+    fechar_logs()
 
     if arquivos_gerados:
         print("✅ Processamento finalizado com sucesso.")
@@ -53,6 +78,7 @@ def processar_arquivos(pasta_entrada, pasta_saida, pasta_logs):
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     pasta_entrada = (
         Path(sys.executable).parent
         if getattr(sys, "frozen", False)
@@ -67,6 +93,7 @@ if __name__ == "__main__":
         escrever_no_log(
             f"⚠️ Erro inesperado: {e}",
             os.path.join(pasta_logs, "erros_processamento.txt"),
+            "ERRO",
         )
         print(f"⚠️ Erro inesperado: {e}")
     except KeyboardInterrupt:
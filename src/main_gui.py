@@ -1,16 +1,20 @@
+import multiprocessing
 import os
+import queue
 import subprocess
 import sys
+import threading
 from pathlib import Path
 
 import customtkinter as ctk
 from PIL import Image
 
-from processamento.me import processar_me
-from processamento.od import processar_od
-from processamento.rf import processar_rf
-from utils.helpers import ano_mes_anterior, pedir_codigo_al
-from utils.log import escrever_no_log
+from processamento.execucao import executar_tarefas, montar_tarefas
+from processamento.progresso import ETAPAS, ProcessamentoCancelado
+from utils.dialogos import pedir_codigo_al
+from utils.log import escrever_no_log, fechar_logs
+
+INTERVALO_PROGRESSO_MS = 100
 
 
 def resource_path(relative_path):
@@ -28,7 +32,7 @@ class App(ctk.CTk):
             self.iconbitmap(resource_path("logo-senac.ico"))
         except Exception:
             pass  # Ignora erro se o ícone não for encontrado
-        self.geometry("700x250")
+        self.geometry("700x290")
         self.resizable(False, False)
         self.configure(fg_color="#f9f9f9")
 
@@ -37,6 +41,13 @@ class App(ctk.CTk):
 
         # Variável de pasta
         self.pasta_entrada = ctk.StringVar()
+        # Reprocessar mesmo arquivos que não mudaram desde a última execução
+        self.forcar = ctk.BooleanVar(value=False)
+
+        # Estado do processamento em segundo plano
+        self._manager = None
+        self._worker = None
+        self._resultados = []
 
         # Carregando imagens PNG para os botões
         # ATENÇÃO: ajuste os caminhos para suas imagens PNG reais
@@ -101,7 +112,7 @@ class App(ctk.CTk):
         frame_botoes = ctk.CTkFrame(frame, fg_color="#f9f9f9", corner_radius=0)
         frame_botoes.pack(pady=20, anchor="w")
 
-        btn_executar = ctk.CTkButton(
+        self.btn_executar = ctk.CTkButton(
             frame_botoes,
             text="Executar",
             width=120,
@@ -110,7 +121,7 @@ class App(ctk.CTk):
             compound="left",
             command=self.executar,
         )
-        btn_executar.pack(side="left", padx=(0, 15))
+        self.btn_executar.pack(side="left", padx=(0, 15))
 
         btn_abrir_saida = ctk.CTkButton(
             frame_botoes,
@@ -123,6 +134,25 @@ class App(ctk.CTk):
         )
         btn_abrir_saida.pack(side="left")
 
+        chk_forcar = ctk.CTkCheckBox(
+            frame_botoes, text="Reprocessar tudo", variable=self.forcar
+        )
+        chk_forcar.pack(side="left", padx=(15, 0))
+
+        # Progresso e cancelamento (só aparecem durante o processamento)
+        self.frame_progresso = ctk.CTkFrame(frame, fg_color="#f9f9f9", corner_radius=0)
+        self.barra_progresso = ctk.CTkProgressBar(self.frame_progresso)
+        self.barra_progresso.pack(side="left", padx=(0, 15), fill="x", expand=True)
+        self.btn_cancelar = ctk.CTkButton(
+            self.frame_progresso,
+            text="Cancelar",
+            width=100,
+            fg_color="#b33a3a",
+            hover_color="#922f2f",
+            command=self.cancelar,
+        )
+        self.btn_cancelar.pack(side="left")
+
         # Label de status
         self.status = ctk.CTkLabel(frame, text="", font=ctk.CTkFont(size=13))
         self.status.pack(pady=(10, 0))
@@ -146,45 +176,125 @@ class App(ctk.CTk):
             self.popup("Aviso", "A pasta de saída ainda não foi gerada.")
 
     def executar(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+
         pasta_entrada = Path(self.pasta_entrada.get())
         if not pasta_entrada.exists():
             self.popup("Erro", "Pasta de entrada inválida.")
             return
 
         pasta_saida = pasta_entrada / "arquivos_importacao"
-        pasta_logs = pasta_entrada / "logs"
+        self.pasta_logs = pasta_entrada / "logs"
         pasta_saida.mkdir(parents=True, exist_ok=True)
-        pasta_logs.mkdir(parents=True, exist_ok=True)
+        self.pasta_logs.mkdir(parents=True, exist_ok=True)
+
+        # Os diálogos de código AL rodam aqui, na thread da interface
+        tarefas = montar_tarefas(
+            pasta_entrada,
+            pasta_saida,
+            self.pasta_logs,
+            pedir_codigo_al,
+            prefixo_log="log_",
+        )
+        if not tarefas:
+            self.status.configure(text="⚠️ Nenhum arquivo gerado.")
+            self.popup("Aviso", "Não foram gerados arquivos.")
+            return
 
-        arquivos = ["ME.xlsx", "OD.xlsx", "RF.xlsx"]
-        arquivos_gerados = []
+        # Fila e evento via Manager para funcionarem também nos processos do pool
+        if self._manager is None:
+            self._manager = multiprocessing.Manager()
+        self.fila = self._manager.Queue()
+        self.cancelamento = self._manager.Event()
+        self._etapas_concluidas = {tarefa.arquivo: 0 for tarefa in tarefas}
+        self._resultados = []
+
+        forcar = self.forcar.get()
+
+        def trabalhar():
+            self._resultados = executar_tarefas(
+                tarefas,
+                forcar=forcar,
+                fila=self.fila,
+                cancelamento=self.cancelamento,
+            )
 
-        for arquivo in arquivos:
-            entrada = pasta_entrada / arquivo
-            if not entrada.exists():
-                continue
+        self.btn_executar.configure(state="disabled")
+        self.btn_cancelar.configure(state="normal", text="Cancelar")
+        self.barra_progresso.set(0)
+        self.frame_progresso.pack(fill="x", pady=(0, 5), before=self.status)
+        self.status.configure(text="⏳ Processando...")
 
-            saida = pasta_saida / f"{arquivo[:2]}{ano_mes_anterior()}.xlsx"
-            log = pasta_logs / f"log_{arquivo[:2].lower()}{ano_mes_anterior()}.txt"
-            codigo_al = pedir_codigo_al(arquivo)
+        self._worker = threading.Thread(target=trabalhar, daemon=True)
+        self._worker.start()
+        self.after(INTERVALO_PROGRESSO_MS, self.acompanhar)
 
+    def cancelar(self):
+        if self._worker is not None and self._worker.is_alive():
+            self.cancelamento.set()
+            self.btn_cancelar.configure(state="disabled", text="Cancelando...")
+            self.status.configure(text="⏹️ Cancelando após a etapa atual...")
+
+    def consumir_eventos(self):
+        while True:
             try:
-                if arquivo == "ME.xlsx":
-                    processar_me(entrada, saida, codigo_al, log)
-                elif arquivo == "OD.xlsx":
-                    processar_od(entrada, saida, codigo_al, log)
-                elif arquivo == "RF.xlsx":
-                    processar_rf(entrada, saida, codigo_al, log)
+                evento = self.fila.get_nowait()
+            except queue.Empty:
+                break
+            indice = ETAPAS.index(evento.etapa) + 1
+            self._etapas_concluidas[evento.arquivo] = max(
+                self._etapas_concluidas[evento.arquivo], indice
+            )
+            linhas = ""
+            if evento.linhas:
+                linhas = f" ({evento.linhas:,} linhas)".replace(",", ".")
+            self.status.configure(text=f"⏳ {evento.arquivo}: {evento.etapa}{linhas}")
+
+        total = len(ETAPAS) * len(self._etapas_concluidas)
+        self.barra_progresso.set(sum(self._etapas_concluidas.values()) / total)
+
+    def acompanhar(self):
+        self.consumir_eventos()
+        if self._worker.is_alive():
+            self.after(INTERVALO_PROGRESSO_MS, self.acompanhar)
+            return
+        # A thread pode ter terminado depois da leitura acima: os eventos que
+        # ela enviou nesse intervalo ainda estão na fila.
+        self.consumir_eventos()
+        self.finalizar()
 
-                if saida.exists():
-                    arquivos_gerados.append(saida)
+    def finalizar(self):
+        self.frame_progresso.pack_forget()
+        self.btn_executar.configure(state="normal")
 
-                escrever_no_log(f"🆗 Processado: {arquivo}", log)
+        arquivos_gerados = []
+        cancelados = 0
+        for resultado in self._resultados:
+            tarefa = resultado.tarefa
+            if isinstance(resultado.erro, ProcessamentoCancelado):
+                cancelados += 1
+                escrever_no_log(f"⏹️ Cancelado: {tarefa.arquivo}", tarefa.caminho_log)
+                continue
+            if resultado.erro is not None:
+                escrever_no_log(
+                    f"⚠️ Erro: {tarefa.arquivo} -> {resultado.erro}",
+                    self.pasta_logs / "erros.txt",
+                    "ERRO",
+                )
+                continue
 
-            except Exception as e:
-                escrever_no_log(f"⚠️ Erro: {arquivo} -> {e}", pasta_logs / "erros.txt")
+            if resultado.gerado:
+                arquivos_gerados.append(tarefa.caminho_saida)
 
-        if arquivos_gerados:
+            escrever_no_log(f"🆗 Processado: {tarefa.arquivo}", tarefa.caminho_log)
+        fechar_logs()
+
+        if cancelados:
+            self.status.configure(
+                text=f"⏹️ Cancelado. {len(arquivos_gerados)} arquivo(s) gerado(s)."
+            )
+        elif arquivos_gerados:
             self.status.configure(
                 text=f"✅ {len(arquivos_gerados)} arquivo(s) gerado(s)."
             )
@@ -260,5 +370,6 @@ class App(ctk.CTk):
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     app = App()
     app.mainloop()
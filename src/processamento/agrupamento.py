@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+ORDEM_PRIMEIRA_OCORRENCIA = "primeira_ocorrencia"
+ORDEM_CPF = "cpf"
+COMPENSACAO = "COMPENSACAO"
+
+
+def agrupar_por_cpf(
+    df: pd.DataFrame, coluna_cpf, coluna_valor, ordem=ORDEM_PRIMEIRA_OCORRENCIA
+) -> pd.DataFrame:
+    """Soma ``coluna_valor`` por CPF numa única passada sobre os dados.
+
+    ``ORDEM_PRIMEIRA_OCORRENCIA`` mantém os CPFs na ordem em que aparecem na
+    planilha; ``ORDEM_CPF`` os ordena pelo próprio CPF. As duas são
+    determinísticas e nenhuma precisa voltar ao DataFrame original.
+    """
+    if ordem not in (ORDEM_PRIMEIRA_OCORRENCIA, ORDEM_CPF):
+        raise ValueError(f"Ordem de agrupamento desconhecida: {ordem!r}")
+    return df.groupby(coluna_cpf, sort=ordem == ORDEM_CPF, as_index=False)[
+        coluna_valor
+    ].sum()
+
+
+def acumular_por_cpf(
+    acumulado: pd.DataFrame | None, df: pd.DataFrame, coluna_cpf, coluna_valor
+) -> pd.DataFrame:
+    """Soma o ``coluna_valor`` (float) de ``df`` por CPF ao ``acumulado``.
+
+    O pandas soma floats por grupo com compensação de Kahan, na ordem das
+    linhas. Aqui a compensação de cada CPF (coluna ``COMPENSACAO``) passa de
+    um bloco para o outro, e as somas saem bit a bit iguais às de
+    ``agrupar_por_cpf`` sobre todos os blocos juntos. CPFs na ordem da
+    primeira ocorrência.
+    """
+    anteriores = pd.Index(
+        [] if acumulado is None else acumulado[coluna_cpf], dtype="int64"
+    )
+    cpfs = df[coluna_cpf].to_numpy("int64")
+    valores = df[coluna_valor].to_numpy("float64")
+    grupos = anteriores.get_indexer(cpfs)
+    novos = grupos < 0
+    grupos_novos, cpfs_novos = pd.factorize(cpfs[novos])
+    grupos[novos] = len(anteriores) + grupos_novos
+
+    somas = np.zeros(len(anteriores) + len(cpfs_novos))
+    compensacoes = np.zeros_like(somas)
+    if acumulado is not None:
+        somas[: len(anteriores)] = acumulado[coluna_valor].to_numpy("float64")
+        compensacoes[: len(anteriores)] = acumulado[COMPENSACAO].to_numpy("float64")
+
+    # A n-ésima linha de cada CPF no bloco só depende das anteriores do mesmo
+    # CPF: cada rodada soma, de uma vez, a n-ésima linha de todos eles.
+    posicoes = pd.Series(grupos).groupby(grupos).cumcount().to_numpy()
+    linhas = np.argsort(posicoes, kind="stable")
+    inicios = np.searchsorted(
+        posicoes[linhas], np.arange(1, posicoes.max(initial=0) + 1)
+    )
+    for rodada in np.split(linhas, inicios):
+        grupo = grupos[rodada]
+        y = valores[rodada] - compensacoes[grupo]
+        t = somas[grupo] + y
+        compensacao = t - somas[grupo] - y
+        # Como no pandas: com valores infinitos a compensação vira NaN e zera.
+        compensacao[np.isnan(compensacao)] = 0
+        compensacoes[grupo] = compensacao
+        somas[grupo] = t
+
+    return pd.DataFrame(
+        {
+            coluna_cpf: np.concatenate([anteriores.to_numpy(), cpfs_novos]),
+            coluna_valor: somas,
+            COMPENSACAO: compensacoes,
+        }
+    )
@@ -0,0 +1,183 @@
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+
+import pandas as pd
+
+from config import CACHE_ENTRADAS
+from processamento.esquema import EntradaTipada
+
+PASTA_SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PASTAS_CODIGO = ("processamento", "utils")
+TAMANHO_BLOCO = 1024 * 1024
+
+
+def hash_arquivo(caminho) -> str:
+    sha = hashlib.sha256()
+    with open(caminho, "rb") as arquivo:
+        while bloco := arquivo.read(TAMANHO_BLOCO):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+def _calcular_versao_codigo() -> str:
+    """Hash dos fontes que geram a saída, para invalidar o cache a cada mudança.
+
+    No executável do PyInstaller os .py não existem; usa o próprio executável.
+    """
+    if getattr(sys, "frozen", False):
+        estado = os.stat(sys.executable)
+        return f"exe-{estado.st_size}-{estado.st_mtime_ns}"
+
+    sha = hashlib.sha256()
+    caminhos = [os.path.join(PASTA_SRC, "config.py")]
+    for pasta in PASTAS_CODIGO:
+        diretorio = os.path.join(PASTA_SRC, pasta)
+        caminhos += [
+            os.path.join(diretorio, nome)
+            for nome in sorted(os.listdir(diretorio))
+            if nome.endswith(".py")
+        ]
+    for caminho in caminhos:
+        sha.update(os.path.relpath(caminho, PASTA_SRC).encode())
+        with open(caminho, "rb") as arquivo:
+            sha.update(arquivo.read())
+    return sha.hexdigest()[:16]
+
+
+VERSAO_CODIGO = _calcular_versao_codigo()
+
+
+def caminho_cache(caminho_saida) -> str:
+    """O registro fica ao lado da saída: ``arquivos_importacao/.ME202403.xlsx.json``."""
+    pasta, nome = os.path.split(os.fspath(caminho_saida))
+    return os.path.join(pasta, f".{nome}.json")
+
+
+def _chave(tarefa, hash_entrada) -> dict:
+    return {
+        "entrada_sha256": hash_entrada,
+        "codigo_al": tarefa.codigo_al,
+        "mes_referencia": tarefa.mes_referencia,
+        "versao_codigo": VERSAO_CODIGO,
+    }
+
+
+def _estado_saida(caminho_saida) -> dict:
+    estado = os.stat(caminho_saida)
+    return {"saida_tamanho": estado.st_size, "saida_mtime_ns": estado.st_mtime_ns}
+
+
+def saida_em_cache(tarefa, hash_entrada) -> bool:
+    """Diz se a saída existente já corresponde à entrada, código AL, mês e versão."""
+    try:
+        with open(caminho_cache(tarefa.caminho_saida), encoding="utf-8") as arquivo:
+            registro = json.load(arquivo)
+        esperado = {
+            **_chave(tarefa, hash_entrada),
+            **_estado_saida(tarefa.caminho_saida),
+        }
+    except (OSError, ValueError):
+        return False
+    return registro == esperado
+
+
+def invalidar_cache(tarefa):
+    try:
+        os.remove(caminho_cache(tarefa.caminho_saida))
+    except FileNotFoundError:
+        pass
+
+
+def registrar_cache(tarefa, hash_entrada):
+    registro = {
+        **_chave(tarefa, hash_entrada),
+        **_estado_saida(tarefa.caminho_saida),
+    }
+    with open(caminho_cache(tarefa.caminho_saida), "w", encoding="utf-8") as arquivo:
+        json.dump(registro, arquivo, indent=2)
+
+
+# Cache da entrada lida e tipada, independente do cache da saída acima: vale
+# mesmo quando muda o código AL ou o mês, que não afetam a leitura.
+
+
+def cache_entrada_disponivel() -> bool:
+    return CACHE_ENTRADAS and importlib.util.find_spec("pyarrow") is not None
+
+
+def caminhos_cache_entrada(caminho_entrada) -> tuple[str, str]:
+    """``ME.xlsx`` → ``.ME.xlsx.entrada.feather`` e ``.ME.xlsx.entrada.json``."""
+    pasta, nome = os.path.split(os.fspath(caminho_entrada))
+    base = os.path.join(pasta, f".{nome}.entrada")
+    return f"{base}.feather", f"{base}.json"
+
+
+def _estado_entrada(caminho_entrada) -> dict:
+    estado = os.stat(caminho_entrada)
+    return {"entrada_tamanho": estado.st_size, "entrada_mtime_ns": estado.st_mtime_ns}
+
+
+def ler_entrada_em_cache(caminho_entrada, chave) -> EntradaTipada | None:
+    """Devolve a entrada tipada guardada para ``caminho_entrada``, se ainda valer.
+
+    O registro é aceito quando tamanho e mtime da planilha batem; se só o mtime
+    mudou (arquivo copiado ou salvo de novo sem alterações), o hash decide.
+    ``chave`` separa leituras feitas com regras diferentes.
+    """
+    if not cache_entrada_disponivel():
+        return None
+    caminho_feather, caminho_registro = caminhos_cache_entrada(caminho_entrada)
+    try:
+        with open(caminho_registro, encoding="utf-8") as arquivo:
+            registro = json.load(arquivo)
+        estado = _estado_entrada(caminho_entrada)
+        if registro["chave"] != chave or registro["versao_codigo"] != VERSAO_CODIGO:
+            return None
+        if {k: registro[k] for k in estado} != estado:
+            if registro["entrada_sha256"] != hash_arquivo(caminho_entrada):
+                return None
+            registro.update(estado)
+            _gravar_json(caminho_registro, registro)
+
+        from pyarrow import feather
+
+        dados = feather.read_table(caminho_feather, memory_map=True).to_pandas()
+    except Exception:
+        return None
+    rejeitados = pd.DataFrame(registro["rejeitados"], columns=registro["colunas"])
+    return EntradaTipada(dados, rejeitados)
+
+
+def gravar_entrada_em_cache(caminho_entrada, chave, entrada: EntradaTipada) -> bool:
+    """Grava a entrada tipada em Feather sem compressão, para ser mapeada na leitura."""
+    if not cache_entrada_disponivel():
+        return False
+    caminho_feather, caminho_registro = caminhos_cache_entrada(caminho_entrada)
+    registro = {
+        "entrada_sha256": hash_arquivo(caminho_entrada),
+        **_estado_entrada(caminho_entrada),
+        "chave": chave,
+        "versao_codigo": VERSAO_CODIGO,
+        "colunas": list(entrada.rejeitados.columns),
+        "rejeitados": entrada.rejeitados.to_dict(orient="split")["data"],
+    }
+    try:
+        from pyarrow import feather
+
+        temporario = f"{caminho_feather}.tmp"
+        feather.write_feather(entrada.dados, temporario, compression="uncompressed")
+        os.replace(temporario, caminho_feather)
+        _gravar_json(caminho_registro, registro)
+    except Exception:
+        return False
+    return True
+
+
+def _gravar_json(caminho, registro):
+    temporario = f"{caminho}.tmp"
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        json.dump(registro, arquivo, ensure_ascii=False, indent=2)
+    os.replace(temporario, caminho)
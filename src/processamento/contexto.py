@@ -0,0 +1,58 @@
+"""Contexto de uma execução: mês de referência e os textos derivados dele.
+
+O mês (o anterior ao atual, ou o informado para reprocessar um mês antigo) é
+resolvido uma única vez por execução, e a data de lançamento, o documento e o
+histórico de cada área saem dele. Assim todas as planilhas de uma execução
+usam o mesmo mês, mesmo que ela atravesse a meia-noite da virada do mês.
+"""
+
+from typing import NamedTuple
+
+from processamento.regras import Regra
+from utils.helpers import (
+    ano_mes_anterior,
+    formatar_historico,
+    nome_documento,
+    ultimo_dia_mes_anterior,
+)
+from utils.validacao import validar_ano_mes
+
+
+class ContextoArea(NamedTuple):
+    """Textos fixos dos lançamentos de uma área, já formatados."""
+
+    mes_referencia: str
+    data_lancamento: str
+    documento: str
+    historico: str
+
+
+class ContextoExecucao(NamedTuple):
+    mes_referencia: str
+    data_lancamento: str
+
+    def da_area(self, regra: Regra, codigo_al) -> ContextoArea:
+        return ContextoArea(
+            self.mes_referencia,
+            self.data_lancamento,
+            nome_documento(regra.tipo, self.mes_referencia),
+            regra.prefixo_historico
+            + formatar_historico(codigo_al, regra.area, self.mes_referencia),
+        )
+
+
+def criar_contexto(mes_referencia=None) -> ContextoExecucao:
+    """Contexto para ``mes_referencia`` (AAAAMM; padrão: o mês anterior)."""
+    mes = validar_ano_mes(mes_referencia) if mes_referencia else ano_mes_anterior()
+    return ContextoExecucao(mes, ultimo_dia_mes_anterior(mes))
+
+
+def contexto_da_area(regra: Regra, codigo_al, contexto=None) -> ContextoArea:
+    """``contexto`` pronto para ``regra``.
+
+    Aceita um ``ContextoArea`` (devolvido como está), um ``ContextoExecucao``
+    ou ``None`` (contexto do mês anterior ao atual).
+    """
+    if isinstance(contexto, ContextoArea):
+        return contexto
+    return (contexto or criar_contexto()).da_area(regra, codigo_al)
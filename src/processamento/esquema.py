@@ -0,0 +1,180 @@
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from utils.cpf import cpfs_de_textos, cpfs_validos
+from utils.helpers import em_fracoes
+
+# Colunas do DataFrame tipado, independentes do nome usado na planilha.
+CPF = "CPF"
+CPF_TITULAR = "CPF_TITULAR"
+VALOR = "VALOR"
+
+# Pontuação aceita em CPFs digitados ("123.456.789-01"); o resto é inválido.
+PONTUACAO_CPF = r"[.\-/\s]"
+# Expoentes de 10+ dígitos estouram o inteiro do parser do pd.to_numeric:
+# "98e6612658355" derruba o processo e "1e4294967296" vira 1.0.
+EXPOENTE_ENORME = r"[eE][+-]?\d{10}"
+# Acima disso o valor em frações de centavo não cabe em int64.
+VALOR_MAXIMO = 1e12
+LINHAS_NO_RESUMO = 10
+# Motivos registrados em ``EntradaTipada.rejeitados``.
+MOTIVO_ILEGIVEL = "ilegível"
+MOTIVO_DIGITOS = "dígitos verificadores"
+
+
+class EntradaTipada(NamedTuple):
+    """Entrada já nos tipos compactos usados no processamento.
+
+    ``dados`` tem CPF e CPF_TITULAR como inteiros de 11 dígitos (``Int64``,
+    nulo quando ausente) e VALOR em frações de centavo (``Int64``), com o
+    índice da planilha original. ``rejeitados`` lista cada célula inválida:
+    LINHA (como no Excel), COLUNA, CONTEUDO e MOTIVO.
+    """
+
+    dados: pd.DataFrame
+    rejeitados: pd.DataFrame
+
+
+def _sem_expoentes_enormes(textos: pd.Series) -> pd.Series:
+    """Anula os textos com ``EXPOENTE_ENORME`` antes do ``pd.to_numeric``."""
+    return textos.mask(textos.astype(str).str.contains(EXPOENTE_ENORME))
+
+
+def converter_cpfs(textos: pd.Series) -> tuple[pd.Series, pd.Series]:
+    """Converte CPFs em texto para ``Int64``; retorna os CPFs e a máscara de inválidos.
+
+    Pontuação e espaços são removidos e zeros à esquerda perdidos pelo Excel
+    voltam na formatação (``formatar_cpfs``). Células vazias viram nulo sem
+    serem consideradas inválidas.
+    """
+    # Caminho rápido: a grande maioria vem só com dígitos ou na máscara.
+    valores, convertidos = cpfs_de_textos(textos.to_numpy(object))
+    cpfs = pd.Series(pd.arrays.IntegerArray(valores, ~convertidos), index=textos.index)
+    invalidos = pd.Series(False, index=textos.index)
+
+    # Depois, os que o pandas lê como número ("12345678909.0", " 123")...
+    restantes = textos[textos.notna().to_numpy(bool) & ~convertidos]
+    if len(restantes):
+        numeros = pd.to_numeric(_sem_expoentes_enormes(restantes), errors="coerce")
+        numeros = numeros.astype("float64")
+        rapidos = (numeros >= 0) & (numeros < 1e11) & (numeros % 1 == 0)
+        cpfs.loc[numeros.index[rapidos]] = numeros[rapidos].astype("int64").to_numpy()
+        restantes = restantes[~rapidos.to_numpy(bool)]
+
+    # ... e por fim os com pontuação.
+    if len(restantes):
+        limpos = restantes.astype("string").str.replace(PONTUACAO_CPF, "", regex=True)
+        limpos = limpos.mask(limpos == "")
+        validos = limpos.str.fullmatch(r"[0-9]{1,11}").fillna(False).to_numpy(bool)
+        cpfs.loc[limpos.index[validos]] = pd.to_numeric(limpos[validos]).to_numpy()
+        invalidos.loc[limpos.index[limpos.notna().to_numpy(bool) & ~validos]] = True
+    return cpfs, invalidos
+
+
+def conferir_digitos(cpfs: pd.Series) -> tuple[pd.Series, pd.Series]:
+    """Anula os CPFs cujos dígitos verificadores não conferem.
+
+    Retorna os CPFs restantes e a máscara dos anulados; nulos continuam nulos
+    sem serem considerados inválidos.
+    """
+    presentes = cpfs.notna().to_numpy(bool)
+    errados = presentes & ~cpfs_validos(cpfs.to_numpy("int64", na_value=0))
+    errados = pd.Series(errados, index=cpfs.index)
+    return cpfs.mask(errados), errados
+
+
+def converter_valores(textos: pd.Series) -> tuple[pd.Series, pd.Series]:
+    """Converte valores em reais para frações de centavo (``Int64``).
+
+    Retorna os valores e a máscara de inválidos (texto não numérico, infinito
+    ou fora do limite). As frações preservam valores com mais de duas casas,
+    arredondados só no total de cada CPF, como antes.
+    """
+    numeros = pd.to_numeric(_sem_expoentes_enormes(textos), errors="coerce")
+    numeros = numeros.astype("float64")
+    aceitos = np.isfinite(numeros) & (numeros.abs() < VALOR_MAXIMO)
+    invalidos = textos.notna() & ~aceitos
+    fracoes = pd.Series(
+        em_fracoes(numeros.where(aceitos, 0)), index=textos.index, dtype="Int64"
+    )
+    return fracoes.mask(~aceitos), invalidos
+
+
+def _rejeitados(
+    textos: pd.Series, invalidos: pd.Series, coluna, motivo=MOTIVO_ILEGIVEL
+) -> pd.DataFrame:
+    selecionados = textos[invalidos]
+    return pd.DataFrame(
+        {
+            "LINHA": selecionados.index + 2,
+            "COLUNA": coluna,
+            "CONTEUDO": selecionados.astype(str).to_numpy(),
+            "MOTIVO": motivo,
+        }
+    )
+
+
+def _tipar_cpfs(textos: pd.Series, coluna, validar_digitos, rejeitados):
+    """CPFs convertidos (e conferidos) e a máscara de todos os inválidos."""
+    cpfs, invalidos = converter_cpfs(textos)
+    rejeitados.append(_rejeitados(textos, invalidos, coluna))
+    if validar_digitos:
+        cpfs, errados = conferir_digitos(cpfs)
+        rejeitados.append(_rejeitados(textos, errados, coluna, MOTIVO_DIGITOS))
+        invalidos = invalidos | errados
+    return cpfs, invalidos
+
+
+def tipar_entrada(
+    df: pd.DataFrame, cpf_coluna, valor_col, validar_digitos=True
+) -> EntradaTipada:
+    """Converte a planilha lida como texto para o esquema tipado.
+
+    Linhas com CPF ou valor inválido são descartadas; um CPF_TITULAR inválido
+    é ignorado (o CPF da própria linha é mantido). Com ``validar_digitos``,
+    CPFs cujos dígitos verificadores não conferem também são inválidos. Tudo
+    é reportado em ``rejeitados``.
+    """
+    rejeitados = []
+    cpfs, cpfs_invalidos = _tipar_cpfs(
+        df[cpf_coluna], cpf_coluna, validar_digitos, rejeitados
+    )
+    valores, valores_invalidos = converter_valores(df[valor_col])
+    rejeitados.append(_rejeitados(df[valor_col], valores_invalidos, valor_col))
+    dados = pd.DataFrame({CPF: cpfs, VALOR: valores}, index=df.index)
+    if CPF_TITULAR in df.columns:
+        dados[CPF_TITULAR], _ = _tipar_cpfs(
+            df[CPF_TITULAR], CPF_TITULAR, validar_digitos, rejeitados
+        )
+
+    dados = dados[~(cpfs_invalidos | valores_invalidos)]
+    rejeitados = pd.concat(rejeitados, ignore_index=True)
+    return EntradaTipada(dados, rejeitados.sort_values("LINHA", kind="stable"))
+
+
+def descrever_rejeitados(rejeitados: pd.DataFrame) -> list[str]:
+    """Uma linha de log por coluna e motivo com células inválidas."""
+    mensagens = []
+    for (coluna, motivo), grupo in rejeitados.groupby(["COLUNA", "MOTIVO"], sort=False):
+        linhas = ", ".join(map(str, grupo["LINHA"].head(LINHAS_NO_RESUMO)))
+        if len(grupo) > LINHAS_NO_RESUMO:
+            linhas += ", ..."
+        if coluna == CPF_TITULAR:
+            descricao = f"{len(grupo)} {coluna} inválido(s) ignorado(s)"
+        else:
+            descricao = f"{len(grupo)} linha(s) descartada(s) por {coluna} inválido"
+        if motivo == MOTIVO_DIGITOS:
+            descricao += " (dígitos verificadores)"
+        mensagens.append(f"⚠️ {descricao} (linhas {linhas})")
+    return mensagens
+
+
+def formatar_cpfs(cpfs: pd.Series) -> pd.Series:
+    """CPFs inteiros de volta para texto com 11 dígitos."""
+    return cpfs.astype("int64").astype(str).str.zfill(11)
+
+
+def formatar_cpf(cpf) -> str:
+    return "" if pd.isna(cpf) else f"{int(cpf):011d}"
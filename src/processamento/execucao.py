@@ -0,0 +1,448 @@
+import cProfile
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import partial
+from typing import NamedTuple
+
+from config import FORMATO_SAIDA, PERFIL_CONFIG
+from processamento.cache import (
+    hash_arquivo,
+    invalidar_cache,
+    registrar_cache,
+    saida_em_cache,
+)
+from processamento.contexto import ContextoArea, contexto_da_area, criar_contexto
+from processamento.lancamentos import iterar_lancamentos
+from processamento.perfil import caminho_relatorio, gravar_relatorio, perfilar
+from processamento.pipeline import (
+    colunas_lidas,
+    gerar_lancamentos,
+    ler_entrada_com_cache,
+    preparar_entrada,
+    processar_area,
+)
+from processamento.progresso import (
+    EventoProgresso,
+    ProcessamentoCancelado,
+    criar_notificador,
+)
+from processamento.regras import compilar_regras
+from utils.escrita import salvar_excel_abas, salvar_saida
+from utils.leitura import ler_abas, listar_abas
+from utils.log import escrever_no_log, fechar_logs
+
+# A tabela de regras é validada aqui, uma vez, ao importar o módulo; um erro
+# em config.REGRAS_AREAS impede a execução antes de qualquer arquivo ser lido.
+REGRAS = compilar_regras()
+PROCESSADORES = {
+    regra.arquivo: partial(processar_area, regra) for regra in REGRAS.values()
+}
+# Nome (sem o AAAAMM) da planilha de importação única, com uma aba por área.
+PREFIXO_SAIDA_UNICA = "IMPORTACAO"
+FORMATOS_SAIDA = ("xlsx", "csv", "txt")
+
+
+class Tarefa(NamedTuple):
+    arquivo: str
+    caminho_entrada: str
+    caminho_saida: str
+    codigo_al: str
+    caminho_log: str
+    contexto: ContextoArea | None = None
+
+    @property
+    def mes_referencia(self) -> str | None:
+        return self.contexto.mes_referencia if self.contexto else None
+
+
+class Resultado(NamedTuple):
+    tarefa: Tarefa
+    gerado: bool
+    erro: Exception | None = None
+    segundos: float = 0.0
+    reaproveitado: bool = False
+
+
+def montar_tarefas(
+    pasta_entrada,
+    pasta_saida,
+    pasta_logs,
+    obter_codigo_al,
+    mes_referencia=None,
+    prefixo_log="log_processamento_",
+    saida_unica=False,
+    formato=None,
+) -> list[Tarefa]:
+    """Monta uma tarefa para cada arquivo de entrada presente na pasta.
+
+    ``obter_codigo_al(arquivo)`` é chamado uma vez por arquivo encontrado, antes
+    de qualquer processamento, para que a execução possa rodar sem interação.
+    O mês de referência (padrão: o anterior ao atual) é resolvido aqui, uma
+    vez para todas as tarefas, com ``criar_contexto``.
+    Com ``saida_unica``, todas as tarefas apontam para a mesma planilha de
+    importação (veja ``executar_carga_unica``). ``formato`` é um dos
+    ``FORMATOS_SAIDA`` (padrão: ``config.FORMATO_SAIDA``) e define a extensão
+    da saída, que por sua vez define como ela é gravada.
+    """
+    contexto = criar_contexto(mes_referencia)
+    return [
+        _montar_tarefa(
+            arquivo,
+            os.path.join(pasta_entrada, arquivo),
+            pasta_saida,
+            pasta_logs,
+            obter_codigo_al,
+            contexto,
+            prefixo_log,
+            saida_unica,
+            formato,
+        )
+        for arquivo in PROCESSADORES
+        if os.path.exists(os.path.join(pasta_entrada, arquivo))
+    ]
+
+
+def montar_tarefas_pasta_de_trabalho(
+    caminho_entrada,
+    pasta_saida,
+    pasta_logs,
+    obter_codigo_al,
+    mes_referencia=None,
+    prefixo_log="log_processamento_",
+    saida_unica=False,
+    formato=None,
+) -> list[Tarefa]:
+    """Uma tarefa por aba de ``caminho_entrada`` com o nome de uma área.
+
+    Para unidades que mandam ME, OD e RF como abas (``ME``, ``od``...) de um
+    único xlsx. Só os nomes das abas são lidos aqui; o conteúdo é lido depois,
+    de uma vez, por ``executar_carga_unica``.
+    """
+    contexto = criar_contexto(mes_referencia)
+    abas = {str(aba).strip().upper() for aba in listar_abas(caminho_entrada)}
+    return [
+        _montar_tarefa(
+            regra.arquivo,
+            caminho_entrada,
+            pasta_saida,
+            pasta_logs,
+            obter_codigo_al,
+            contexto,
+            prefixo_log,
+            saida_unica,
+            formato,
+        )
+        for regra in REGRAS.values()
+        if regra.tipo.upper() in abas
+    ]
+
+
+def _montar_tarefa(
+    arquivo,
+    caminho_entrada,
+    pasta_saida,
+    pasta_logs,
+    obter_codigo_al,
+    contexto,
+    prefixo_log,
+    saida_unica,
+    formato,
+) -> Tarefa:
+    ano_mes = contexto.mes_referencia
+    tipo = os.path.splitext(arquivo)[0]
+    formato = formato or FORMATO_SAIDA
+    if formato not in FORMATOS_SAIDA:
+        raise ValueError(f"Formato de saída desconhecido: {formato!r}")
+    if saida_unica:
+        # Uma aba por área só existe no xlsx.
+        nome_saida, formato = PREFIXO_SAIDA_UNICA, "xlsx"
+    else:
+        nome_saida = tipo
+    codigo_al = obter_codigo_al(arquivo)
+    return Tarefa(
+        arquivo,
+        caminho_entrada,
+        os.path.join(pasta_saida, f"{nome_saida}{ano_mes}.{formato}"),
+        codigo_al,
+        os.path.join(pasta_logs, f"{prefixo_log}{tipo.lower()}{ano_mes}.txt"),
+        contexto.da_area(REGRAS[tipo], codigo_al),
+    )
+
+
+def executar_tarefa(
+    tarefa: Tarefa, forcar=False, progresso=None, cprofile=False
+) -> tuple[bool, bool]:
+    """Processa um arquivo e retorna ``(gerado, reaproveitado)``.
+
+    Se a saída existente corresponde à mesma entrada, código AL, mês e versão
+    do código, o processamento é pulado, a menos que ``forcar``. ``progresso``
+    é repassado ao processador (veja ``processamento.progresso``). Fecha os
+    logs ao final porque, num processo do pool, ninguém mais o faria.
+
+    Cada processamento grava o relatório de etapas em ``<log>_perfil.json``
+    (veja ``PERFIL_CONFIG``); com ``cprofile``, também o ``<log>_perfil.prof``,
+    que pode ser aberto com ``python -m pstats`` ou o snakeviz.
+    """
+    hash_entrada = hash_arquivo(tarefa.caminho_entrada)
+    if not forcar and saida_em_cache(tarefa, hash_entrada):
+        escrever_no_log(
+            f"♻️ {tarefa.arquivo} sem alterações; saída reaproveitada: "
+            f"{tarefa.caminho_saida}",
+            tarefa.caminho_log,
+        )
+        fechar_logs()
+        return True, True
+
+    invalidar_cache(tarefa)
+    estado_anterior = _mtime(tarefa.caminho_saida)
+    processar = PROCESSADORES[tarefa.arquivo]
+    relatorio = PERFIL_CONFIG["relatorio"] or cprofile
+    inicio = datetime.now()
+    cronometro = time.perf_counter()
+    erro = None
+    with perfilar(relatorio and PERFIL_CONFIG["memoria"]) as perfil:
+        perfilador = cProfile.Profile() if cprofile else None
+        try:
+            if perfilador is not None:
+                perfilador.enable()
+            processar(
+                tarefa.caminho_entrada,
+                tarefa.caminho_saida,
+                tarefa.codigo_al,
+                tarefa.caminho_log,
+                tarefa.contexto,
+                progresso,
+            )
+        except Exception as e:
+            erro = e
+            raise
+        finally:
+            if perfilador is not None:
+                perfilador.disable()
+                perfilador.dump_stats(caminho_relatorio(tarefa.caminho_log, ".prof"))
+            fechar_logs()
+            if relatorio:
+                segundos = time.perf_counter() - cronometro
+                _gravar_perfil(tarefa, perfil, inicio, segundos, erro, cprofile)
+
+    # Os processadores registram o erro no log e retornam sem exceção; só
+    # conta como gerada a saída que foi (re)escrita agora.
+    estado_atual = _mtime(tarefa.caminho_saida)
+    gerado = estado_atual is not None and estado_atual != estado_anterior
+    if gerado:
+        registrar_cache(tarefa, hash_entrada)
+    return gerado, False
+
+
+def _gravar_perfil(tarefa: Tarefa, perfil, inicio, segundos, erro=None, cprofile=False):
+    prof = caminho_relatorio(tarefa.caminho_log, ".prof")
+    gravar_relatorio(
+        caminho_relatorio(tarefa.caminho_log),
+        {
+            "arquivo": tarefa.arquivo,
+            "entrada": os.fspath(tarefa.caminho_entrada),
+            "saida": os.fspath(tarefa.caminho_saida),
+            "mes_referencia": tarefa.mes_referencia,
+            "inicio": inicio.isoformat(timespec="seconds"),
+            "segundos": round(segundos, 4),
+            "erro": str(erro) if erro is not None else None,
+            "memoria_medida": perfil.memoria,
+            "cprofile": prof if cprofile else None,
+            "etapas": perfil.relatorio(),
+        },
+    )
+
+
+def _mtime(caminho):
+    try:
+        return os.stat(caminho).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def executar_carga_unica(tarefas, saida_unica=False) -> list[Resultado]:
+    """Processa as tarefas no processo atual, lendo cada xlsx uma única vez.
+
+    Tarefas cujo ``caminho_entrada`` não é o próprio arquivo da área (ex.:
+    ``AL.xlsx`` em vez de ``ME.xlsx``) são abas de uma pasta de trabalho: as
+    abas de um mesmo arquivo são lidas juntas, numa só abertura. As demais
+    usam o arquivo da área (e o cache de entradas), como em
+    ``executar_tarefa``.
+
+    Com ``saida_unica``, os lançamentos de todas as áreas são gravados como
+    abas da planilha em ``caminho_saida`` (a mesma em todas as tarefas), numa
+    só escrita. O cache de saídas não é usado neste modo.
+    """
+    tarefas = list(tarefas)
+    abas_por_arquivo = {}
+    for tarefa in tarefas:
+        if os.path.basename(tarefa.caminho_entrada) != tarefa.arquivo:
+            regra = REGRAS[os.path.splitext(tarefa.arquivo)[0]]
+            pedidos = abas_por_arquivo.setdefault(tarefa.caminho_entrada, {})
+            pedidos[regra.tipo] = (colunas_lidas(regra), regra.cpf_sem_maiusculas)
+
+    lidas = {}
+    for caminho, pedidos in abas_por_arquivo.items():
+        inicio = time.perf_counter()
+        try:
+            lidas[caminho] = ler_abas(caminho, pedidos, dtype=str)
+        except Exception as e:
+            lidas[caminho] = e
+            continue
+        segundos = time.perf_counter() - inicio
+        for tarefa in tarefas:
+            if tarefa.caminho_entrada == caminho:
+                escrever_no_log(
+                    f"📚 Abas {', '.join(pedidos)} lidas de {caminho} "
+                    f"em {segundos:.2f} s",
+                    tarefa.caminho_log,
+                )
+
+    resultados = []
+    lancamentos = {}
+    for tarefa in tarefas:
+        inicio = time.perf_counter()
+        regra = REGRAS[os.path.splitext(tarefa.arquivo)[0]]
+        try:
+            escrever_no_log(
+                f"🔹 Iniciando processamento do arquivo {regra.tipo}...",
+                tarefa.caminho_log,
+            )
+            entrada = _entrada_carga_unica(regra, tarefa, lidas)
+            if entrada is None:
+                resultados.append(
+                    Resultado(tarefa, False, None, time.perf_counter() - inicio)
+                )
+                continue
+            planilha_final, linhas_finais = gerar_lancamentos(
+                regra,
+                entrada,
+                contexto_da_area(regra, tarefa.codigo_al, tarefa.contexto),
+                tarefa.caminho_log,
+            )
+            if saida_unica:
+                lancamentos[tarefa] = (planilha_final, linhas_finais)
+                continue
+            estado_anterior = _mtime(tarefa.caminho_saida)
+            salvar_saida(
+                iterar_lancamentos(planilha_final, linhas_finais),
+                tarefa.caminho_saida,
+                tarefa.caminho_log,
+            )
+            gerado = _mtime(tarefa.caminho_saida) not in (None, estado_anterior)
+            if gerado:
+                escrever_no_log(
+                    f"✅ Arquivo {regra.tipo} gerado com sucesso: "
+                    f"{tarefa.caminho_saida}",
+                    tarefa.caminho_log,
+                )
+            resultados.append(
+                Resultado(tarefa, gerado, None, time.perf_counter() - inicio)
+            )
+        except Exception as e:
+            resultados.append(Resultado(tarefa, False, e, time.perf_counter() - inicio))
+        finally:
+            fechar_logs()
+
+    if lancamentos:
+        resultados += _gravar_saida_unica(lancamentos)
+        ordem = {tarefa: i for i, tarefa in enumerate(tarefas)}
+        resultados.sort(key=lambda resultado: ordem[resultado.tarefa])
+    return resultados
+
+
+def _entrada_carga_unica(regra, tarefa: Tarefa, lidas):
+    lida = lidas.get(tarefa.caminho_entrada)
+    if isinstance(lida, Exception):
+        raise lida
+    if lida is not None:
+        return preparar_entrada(regra, lida[regra.tipo], tarefa.caminho_log)
+    return ler_entrada_com_cache(regra, tarefa.caminho_entrada, tarefa.caminho_log)
+
+
+def _gravar_saida_unica(lancamentos: dict) -> list[Resultado]:
+    tarefas = list(lancamentos)
+    caminho_saida = tarefas[0].caminho_saida
+    inicio = time.perf_counter()
+    gerado = salvar_excel_abas(
+        {
+            os.path.splitext(tarefa.arquivo)[0]: iterar_lancamentos(*blocos)
+            for tarefa, blocos in lancamentos.items()
+        },
+        caminho_saida,
+        tarefas[0].caminho_log,
+    )
+    segundos = (time.perf_counter() - inicio) / len(tarefas)
+    for tarefa in tarefas:
+        if gerado:
+            escrever_no_log(
+                f"✅ Aba {os.path.splitext(tarefa.arquivo)[0]} gravada em "
+                f"{caminho_saida}",
+                tarefa.caminho_log,
+            )
+    fechar_logs()
+    return [Resultado(tarefa, gerado, None, segundos) for tarefa in tarefas]
+
+
+def executar_tarefas(
+    tarefas,
+    paralelo=True,
+    max_workers=None,
+    forcar=False,
+    fila=None,
+    cancelamento=None,
+    cprofile=False,
+) -> list[Resultado]:
+    """Executa as tarefas (em processos separados se ``paralelo``).
+
+    Os erros são capturados por arquivo, então uma falha em um deles não
+    interrompe os demais. ``max_workers`` limita quantos arquivos rodam ao
+    mesmo tempo e ``forcar`` ignora o cache de saídas. Os resultados seguem a
+    ordem de ``tarefas``, cada um com o tempo gasto no processamento.
+
+    Se informados, ``fila`` recebe um ``EventoProgresso`` ao fim de cada etapa
+    e ``cancelamento`` interrompe os arquivos na próxima etapa. Com
+    ``paralelo``, ambos precisam ser compartilháveis entre processos (ex.:
+    ``multiprocessing.Manager().Queue()`` e ``.Event()``). ``cprofile`` grava
+    um perfil do cProfile por arquivo, ao lado do log.
+    """
+    tarefas = list(tarefas)
+    if not paralelo or len(tarefas) < 2:
+        return [
+            _executar_capturando(tarefa, forcar, fila, cancelamento, cprofile)
+            for tarefa in tarefas
+        ]
+
+    max_workers = max_workers or min(len(tarefas), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futuros = [
+            executor.submit(
+                _executar_capturando, tarefa, forcar, fila, cancelamento, cprofile
+            )
+            for tarefa in tarefas
+        ]
+        resultados = []
+        for tarefa, futuro in zip(tarefas, futuros):
+            try:
+                resultados.append(futuro.result())
+            except Exception as e:
+                resultados.append(Resultado(tarefa, False, e))
+    return resultados
+
+
+def _executar_capturando(
+    tarefa: Tarefa, forcar=False, fila=None, cancelamento=None, cprofile=False
+) -> Resultado:
+    inicio = time.perf_counter()
+    progresso = criar_notificador(tarefa.arquivo, fila, cancelamento)
+    try:
+        if cancelamento is not None and cancelamento.is_set():
+            raise ProcessamentoCancelado(f"{tarefa.arquivo}: cancelado")
+        gerado, reaproveitado = executar_tarefa(tarefa, forcar, progresso, cprofile)
+    except Exception as e:
+        return Resultado(tarefa, False, e, time.perf_counter() - inicio)
+    if fila is not None:
+        fila.put(EventoProgresso(tarefa.arquivo, "concluido"))
+    return Resultado(tarefa, gerado, None, time.perf_counter() - inicio, reaproveitado)
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+from config import TEMPLATE_IMPORTACAO_BASE
+
+COLUNAS = list(TEMPLATE_IMPORTACAO_BASE)
+POSICAO_VALOR = COLUNAS.index("VALOR")
+POSICAO_SEQUENCIA = COLUNAS.index("SEQUENCIA")
+POSICAO_CLIENTE = COLUNAS.index("CLIENTE")
+
+
+class BlocoLancamentos:
+    """Lançamentos por CPF guardados só com o que muda de uma linha para outra.
+
+    CPF (``int64``) e VALOR (``float64``) ficam em arrays e a SEQUENCIA é
+    implícita, a partir de ``sequencia_inicial``. As demais colunas têm o mesmo
+    valor em todas as linhas e ficam uma vez só em ``constantes``, na ordem do
+    template; as linhas completas só são montadas na escrita, uma por vez.
+    """
+
+    __slots__ = ("constantes", "cpfs", "valores", "sequencia_inicial")
+
+    def __init__(self, constantes, cpfs, valores, sequencia_inicial=1):
+        self.constantes = tuple(constantes)
+        self.cpfs = cpfs
+        self.valores = valores
+        self.sequencia_inicial = sequencia_inicial
+
+    def __len__(self):
+        return len(self.valores)
+
+    def linhas(self):
+        """Gera as linhas (tuplas na ordem do template), com o CPF formatado."""
+        linha = list(self.constantes)
+        sequencias = range(self.sequencia_inicial, self.sequencia_inicial + len(self))
+        for cpf, valor, sequencia in zip(
+            self.cpfs.tolist(), self.valores.tolist(), sequencias
+        ):
+            linha[POSICAO_CLIENTE] = f"{cpf:011d}"
+            linha[POSICAO_VALOR] = valor
+            linha[POSICAO_SEQUENCIA] = sequencia
+            yield tuple(linha)
+
+
+def montar_lancamentos(
+    cpfs, valores, campos: dict, sequencia_inicial: int = 1
+) -> BlocoLancamentos:
+    """Monta o bloco de lançamentos por CPF de uma só vez, em formato colunar.
+
+    ``cpfs`` são os CPFs inteiros agrupados e ``valores`` os valores em reais
+    de cada um; ``campos`` completa as constantes do template.
+    """
+    constantes = TEMPLATE_IMPORTACAO_BASE.copy()
+    constantes.update(campos)
+    return BlocoLancamentos(
+        constantes.values(),
+        pd.Series(cpfs).to_numpy("int64"),
+        pd.Series(valores, dtype="float64").to_numpy(),
+        sequencia_inicial,
+    )
+
+
+def montar_linha(campos: dict) -> dict:
+    """Monta uma linha avulsa (50% ou total) a partir do template."""
+    linha = TEMPLATE_IMPORTACAO_BASE.copy()
+    linha.update(campos)
+    return linha
+
+
+def iterar_lancamentos(bloco: BlocoLancamentos, linhas):
+    """Gera as linhas de saída (tuplas na ordem do template), bloco e avulsas."""
+    yield from bloco.linhas()
+    for linha in linhas:
+        yield tuple(linha[coluna] for coluna in COLUNAS)
@@ -0,0 +1,163 @@
+import json
+import os
+import time
+from datetime import datetime
+from typing import NamedTuple
+
+from processamento.execucao import executar_tarefas, montar_tarefas
+from utils.log import fechar_logs
+from utils.validacao import normalizar_codigo_al, validar_ano_mes
+
+
+class Job(NamedTuple):
+    unidade: str
+    mes_referencia: str
+    pasta: str
+
+
+def carregar_manifesto(caminho) -> dict:
+    """Lê o manifesto de códigos AL.
+
+    Formato (JSON)::
+
+        {
+            "unidade_a": {"ME": "123", "OD": "456", "RF": "789"},
+            "unidade_b": {"*": "321"},
+            "unidade_b/202402": {"RF": "654"}
+        }
+
+    A chave ``"<unidade>/<AAAAMM>"`` sobrepõe a da unidade naquele mês e
+    ``"*"`` vale para os arquivos sem código próprio. Códigos nulos ou vazios
+    contam como ausentes.
+    """
+    with open(caminho, encoding="utf-8") as arquivo:
+        manifesto = json.load(arquivo)
+    normalizado = {}
+    for chave, codigos in manifesto.items():
+        normalizado[chave] = {}
+        for tipo, codigo in codigos.items():
+            codigo = normalizar_codigo_al("" if codigo is None else str(codigo))
+            if codigo is not None:
+                normalizado[chave][tipo.upper()] = codigo
+    return normalizado
+
+
+def descobrir_jobs(raiz) -> list[Job]:
+    """Lista as pastas ``<raiz>/<unidade>/<AAAAMM>``, em ordem."""
+    jobs = []
+    for unidade in sorted(os.listdir(raiz)):
+        pasta_unidade = os.path.join(raiz, unidade)
+        if not os.path.isdir(pasta_unidade):
+            continue
+        for mes in sorted(os.listdir(pasta_unidade)):
+            pasta = os.path.join(pasta_unidade, mes)
+            if not os.path.isdir(pasta) or not _eh_ano_mes(mes):
+                continue
+            jobs.append(Job(unidade, mes, pasta))
+    return jobs
+
+
+def _eh_ano_mes(nome) -> bool:
+    try:
+        validar_ano_mes(nome)
+    except ValueError:
+        return False
+    return True
+
+
+def codigos_do_job(manifesto, job: Job) -> dict:
+    return {
+        **manifesto.get(job.unidade, {}),
+        **manifesto.get(f"{job.unidade}/{job.mes_referencia}", {}),
+    }
+
+
+def executar_lote(
+    raiz,
+    manifesto,
+    max_workers=None,
+    caminho_relatorio=None,
+    forcar=False,
+    cprofile=False,
+    formato=None,
+) -> dict:
+    """Processa todas as unidades/meses de ``raiz`` num único pool de processos.
+
+    Cada job grava em ``<pasta do job>/arquivos_importacao`` e ``logs``, como
+    na execução de uma pasta só. No fim, um relatório consolidado em JSON é
+    gravado em ``caminho_relatorio`` (padrão: ``<raiz>/relatorio_lote_<data>.json``).
+    """
+    inicio = datetime.now()
+    cronometro = time.perf_counter()
+
+    itens = []
+    tarefas = []
+    for job in descobrir_jobs(raiz):
+        codigos = codigos_do_job(manifesto, job)
+        pasta_saida = os.path.join(job.pasta, "arquivos_importacao")
+        pasta_logs = os.path.join(job.pasta, "logs")
+        tarefas_job = montar_tarefas(
+            job.pasta,
+            pasta_saida,
+            pasta_logs,
+            lambda arquivo: codigos.get(os.path.splitext(arquivo)[0], codigos.get("*")),
+            job.mes_referencia,
+            formato=formato,
+        )
+        if tarefas_job:
+            os.makedirs(pasta_saida, exist_ok=True)
+            os.makedirs(pasta_logs, exist_ok=True)
+        for tarefa in tarefas_job:
+            item = {
+                "unidade": job.unidade,
+                "mes_referencia": job.mes_referencia,
+                "arquivo": tarefa.arquivo,
+                "codigo_al": tarefa.codigo_al,
+                "saida": tarefa.caminho_saida,
+                "log": tarefa.caminho_log,
+            }
+            itens.append(item)
+            if tarefa.codigo_al:
+                tarefas.append((item, tarefa))
+            else:
+                item.update(status="sem_codigo_al", segundos=0.0, erro=None)
+
+    resultados = executar_tarefas(
+        [tarefa for _, tarefa in tarefas],
+        max_workers=max_workers,
+        forcar=forcar,
+        cprofile=cprofile,
+    )
+    fechar_logs()
+    for (item, _), resultado in zip(tarefas, resultados):
+        if resultado.erro is not None:
+            status = "erro"
+        elif resultado.reaproveitado:
+            status = "reaproveitado"
+        else:
+            status = "ok" if resultado.gerado else "sem_saida"
+        item.update(
+            status=status,
+            segundos=round(resultado.segundos, 3),
+            erro=str(resultado.erro) if resultado.erro is not None else None,
+        )
+
+    resumo = {}
+    for item in itens:
+        resumo[item["status"]] = resumo.get(item["status"], 0) + 1
+
+    relatorio = {
+        "raiz": os.fspath(raiz),
+        "inicio": inicio.isoformat(timespec="seconds"),
+        "duracao_segundos": round(time.perf_counter() - cronometro, 3),
+        "max_workers": max_workers or min(len(tarefas), os.cpu_count() or 1) or 1,
+        "resumo": resumo,
+        "jobs": itens,
+    }
+    caminho_relatorio = caminho_relatorio or os.path.join(
+        raiz, f"relatorio_lote_{inicio:%Y%m%d_%H%M%S}.json"
+    )
+    with open(caminho_relatorio, "w", encoding="utf-8") as arquivo:
+        json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+    relatorio["caminho"] = caminho_relatorio
+    return relatorio
@@ -0,0 +1,210 @@
+"""Troca pelo titular e soma por CPF de uma entrada grande, em vários processos.
+
+As colunas tipadas (valores e máscara de nulos de CPF, CPF_TITULAR e VALOR)
+são copiadas uma vez para blocos de ``multiprocessing.shared_memory`` e o
+trabalho é feito em duas rodadas no mesmo pool:
+
+1. cada processo resolve o titular de uma fatia de linhas e grava o CPF
+   resultante num bloco compartilhado;
+2. cada processo soma os CPFs da sua partição (``CPF % processos``), que não
+   se repetem em outra partição, e grava CPF, soma e posição da primeira
+   ocorrência no trecho do bloco de saída reservado a ela.
+
+Como as partições são disjuntas, juntar os resultados é só concatenar e
+ordenar. Pelo pool passam só nomes de blocos e contagens: nenhum array é
+serializado.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from config import AGRUPAMENTO_PARALELO
+from processamento.agrupamento import ORDEM_CPF, ORDEM_PRIMEIRA_OCORRENCIA
+from processamento.esquema import CPF, CPF_TITULAR, VALOR
+from processamento.titulares import resolver_titulares
+from utils.helpers import fracoes_para_reais
+
+POSICAO = "POSICAO"
+
+
+def processos_para(linhas, configuracao=AGRUPAMENTO_PARALELO) -> int:
+    """Quantos processos usar para ``linhas`` linhas (1 = sem paralelismo)."""
+    if configuracao["min_linhas"] is None or linhas < configuracao["min_linhas"]:
+        return 1
+    return max(1, configuracao["processos"] or os.cpu_count() or 1)
+
+
+def _criar_bloco(array: np.ndarray):
+    bloco = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, array.dtype, buffer=bloco.buf)[:] = array
+    return bloco
+
+
+def _descrever(bloco, dtype, tamanho):
+    return bloco.name, np.dtype(dtype).str, tamanho
+
+
+def _anexar(descricao):
+    nome, dtype, tamanho = descricao
+    bloco = shared_memory.SharedMemory(name=nome)
+    return bloco, np.ndarray((tamanho,), dtype, buffer=bloco.buf)
+
+
+def _anexados(descricoes, blocos):
+    """Anexa os blocos de ``descricoes`` (árvore de tuplas) e devolve os arrays."""
+    if isinstance(descricoes, dict):
+        return {nome: _anexados(d, blocos) for nome, d in descricoes.items()}
+    if isinstance(descricoes[0], str):
+        bloco, array = _anexar(descricoes)
+        blocos.append(bloco)
+        return array
+    return [_anexados(d, blocos) for d in descricoes]
+
+
+def _no_pool(funcao, descricoes, *argumentos):
+    """Roda ``funcao(arrays, *argumentos)`` e solta os blocos anexados."""
+    blocos = []
+    try:
+        return funcao(_anexados(descricoes, blocos), *argumentos)
+    finally:
+        for bloco in blocos:
+            bloco.close()
+
+
+def _resolver_fatia(arrays, inicio, fim, somente_se_diferente) -> int:
+    """Rodada 1: grava o CPF após a troca pelo titular; devolve as trocas."""
+    entrada, (resolvidos, validos) = arrays
+    df = pd.DataFrame(
+        {
+            nome: pd.arrays.IntegerArray(valores[inicio:fim], mascara[inicio:fim])
+            for nome, (valores, mascara) in entrada.items()
+        }
+    )
+    substituicao = resolver_titulares(
+        df, CPF, somente_se_diferente=somente_se_diferente
+    )
+    resolvidos[inicio:fim] = substituicao.cpfs.to_numpy("int64", na_value=0)
+    validos[inicio:fim] = (substituicao.cpfs.notna() & df[VALOR].notna()).to_numpy()
+    return substituicao.total
+
+
+def _somar_particao(arrays, particao, particoes, inicio) -> int:
+    """Rodada 2: soma por CPF da partição; devolve quantos CPFs gravou."""
+    (resolvidos, validos, valores), (cpfs, somas, posicoes) = arrays
+    linhas = np.flatnonzero(validos & (resolvidos % particoes == particao))
+    parcial = (
+        pd.DataFrame(
+            {
+                CPF: resolvidos[linhas],
+                VALOR: fracoes_para_reais(valores[linhas]),
+                POSICAO: linhas,
+            }
+        )
+        .groupby(CPF, sort=False)
+        .agg({VALOR: "sum", POSICAO: "first"})
+    )
+    fim = inicio + len(parcial)
+    cpfs[inicio:fim] = parcial.index.to_numpy()
+    somas[inicio:fim] = parcial[VALOR].to_numpy()
+    posicoes[inicio:fim] = parcial[POSICAO].to_numpy()
+    return len(parcial)
+
+
+def agrupar_em_paralelo(
+    df: pd.DataFrame, ordem, somente_se_diferente=False, processos=None
+) -> tuple[pd.DataFrame, int]:
+    """Resolve titulares e soma VALOR por CPF usando ``processos`` processos.
+
+    ``df`` está no esquema de ``EntradaTipada``. Retorna o mesmo DataFrame
+    que a troca pelo titular seguida de ``agrupar_por_cpf`` daria (CPF em
+    ``int64`` e VALOR em reais, na ``ordem`` pedida) e o total de CPFs
+    trocados. Cada CPF é somado inteiro por um só processo, na ordem das
+    linhas, e a soma em float sai igual à do pandas numa passada só.
+    """
+    if ordem not in (ORDEM_PRIMEIRA_OCORRENCIA, ORDEM_CPF):
+        raise ValueError(f"Ordem de agrupamento desconhecida: {ordem!r}")
+    processos = processos or processos_para(len(df))
+    total_linhas = len(df)
+    blocos = []
+
+    def compartilhar(array):
+        bloco = _criar_bloco(array)
+        blocos.append(bloco)
+        return _descrever(bloco, array.dtype, len(array))
+
+    def local(descricao):
+        return np.ndarray(
+            (descricao[2],), descricao[1], buffer=blocos_por_nome[descricao[0]].buf
+        )
+
+    try:
+        entrada = {
+            nome: (
+                compartilhar(df[nome].to_numpy("int64", na_value=0)),
+                compartilhar(df[nome].isna().to_numpy()),
+            )
+            for nome in (CPF, CPF_TITULAR, VALOR)
+            if nome in df.columns
+        }
+        resolvidos = compartilhar(np.zeros(total_linhas, "int64"))
+        validos = compartilhar(np.zeros(total_linhas, bool))
+        saida = [
+            compartilhar(np.zeros(total_linhas, dtype))
+            for dtype in ("int64", "float64", "int64")
+        ]
+        blocos_por_nome = {bloco.name: bloco for bloco in blocos}
+
+        limites = np.linspace(0, total_linhas, processos + 1, dtype="int64")
+        with ProcessPoolExecutor(max_workers=processos) as executor:
+            trocas = sum(
+                executor.map(
+                    _no_pool,
+                    [_resolver_fatia] * processos,
+                    [(entrada, (resolvidos, validos))] * processos,
+                    limites[:-1].tolist(),
+                    limites[1:].tolist(),
+                    [somente_se_diferente] * processos,
+                )
+            )
+
+            # Cada partição recebe um trecho da saída do tamanho das suas
+            # linhas, o máximo de CPFs distintos que ela pode ter.
+            cpfs_validos = local(resolvidos)[local(validos)]
+            linhas_por_particao = np.bincount(
+                cpfs_validos % processos, minlength=processos
+            )
+            del cpfs_validos
+            inicios = np.concatenate([[0], np.cumsum(linhas_por_particao)[:-1]])
+            quantidades = list(
+                executor.map(
+                    _no_pool,
+                    [_somar_particao] * processos,
+                    [((resolvidos, validos, entrada[VALOR][0]), saida)] * processos,
+                    range(processos),
+                    [processos] * processos,
+                    inicios.tolist(),
+                )
+            )
+
+        cpfs, somas, posicoes = (
+            np.concatenate(
+                [np.zeros(0, descricao[1])]
+                + [
+                    local(descricao)[inicio : inicio + quantidade].copy()
+                    for inicio, quantidade in zip(inicios, quantidades)
+                ]
+            )
+            for descricao in saida
+        )
+    finally:
+        for bloco in blocos:
+            bloco.close()
+            bloco.unlink()
+
+    ordenacao = np.argsort(cpfs if ordem == ORDEM_CPF else posicoes, kind="stable")
+    agrupado = pd.DataFrame({CPF: cpfs[ordenacao], VALOR: somas[ordenacao]})
+    return agrupado, trocas
@@ -0,0 +1,113 @@
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+MB = 1024 * 1024
+
+
+class MedicaoEtapa:
+    """Medição de uma etapa; quem mede informa ``linhas_saida`` ao terminar."""
+
+    def __init__(self, nome, linhas_entrada=None):
+        self.nome = nome
+        self.linhas_entrada = linhas_entrada
+        self.linhas_saida = None
+        self.segundos = 0.0
+        self.pico_memoria_mb = None
+
+    def como_dict(self) -> dict:
+        return {
+            "etapa": self.nome,
+            "segundos": round(self.segundos, 4),
+            "linhas_entrada": self.linhas_entrada,
+            "linhas_saida": self.linhas_saida,
+            "pico_memoria_mb": self.pico_memoria_mb,
+        }
+
+
+class Perfil:
+    """Tempo, linhas e pico de memória de cada etapa de um processamento.
+
+    O pico de memória vem do ``tracemalloc`` (alocações do Python e do NumPy)
+    e é o máximo atingido durante a etapa, não a diferença para o início.
+    """
+
+    def __init__(self, memoria=True):
+        self.memoria = memoria
+        self.etapas = []
+        self._iniciou_tracemalloc = False
+
+    def iniciar(self):
+        if self.memoria and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._iniciou_tracemalloc = True
+
+    def encerrar(self):
+        if self._iniciou_tracemalloc:
+            tracemalloc.stop()
+            self._iniciou_tracemalloc = False
+
+    @contextmanager
+    def etapa(self, nome, linhas_entrada=None):
+        medicao = MedicaoEtapa(nome, linhas_entrada)
+        medir_memoria = self.memoria and tracemalloc.is_tracing()
+        if medir_memoria:
+            tracemalloc.reset_peak()
+        inicio = time.perf_counter()
+        try:
+            yield medicao
+        finally:
+            medicao.segundos = time.perf_counter() - inicio
+            if medir_memoria:
+                pico = tracemalloc.get_traced_memory()[1]
+                medicao.pico_memoria_mb = round(pico / MB, 2)
+            self.etapas.append(medicao)
+
+    def relatorio(self) -> list[dict]:
+        return [medicao.como_dict() for medicao in self.etapas]
+
+
+_perfil_atual = None
+
+
+@contextmanager
+def perfilar(memoria=True):
+    """Ativa um ``Perfil`` para as chamadas de ``etapa`` feitas dentro do bloco."""
+    global _perfil_atual
+    perfil = Perfil(memoria)
+    anterior, _perfil_atual = _perfil_atual, perfil
+    perfil.iniciar()
+    try:
+        yield perfil
+    finally:
+        perfil.encerrar()
+        _perfil_atual = anterior
+
+
+@contextmanager
+def etapa(nome, linhas_entrada=None):
+    """Mede uma etapa no perfil ativo; sem perfil ativo, só executa o bloco.
+
+    Uso::
+
+        with etapa("agrupamento", len(df)) as medicao:
+            df_agrupado = ...
+            medicao.linhas_saida = len(df_agrupado)
+    """
+    if _perfil_atual is None:
+        yield MedicaoEtapa(nome, linhas_entrada)
+        return
+    with _perfil_atual.etapa(nome, linhas_entrada) as medicao:
+        yield medicao
+
+
+def caminho_relatorio(caminho_log, extensao=".json") -> str:
+    """``logs/log_processamento_me202403.txt`` → ``..._me202403_perfil.json``."""
+    return f"{os.path.splitext(os.fspath(caminho_log))[0]}_perfil{extensao}"
+
+
+def gravar_relatorio(caminho, dados: dict):
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        json.dump(dados, arquivo, ensure_ascii=False, indent=2)
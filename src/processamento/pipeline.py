@@ -0,0 +1,476 @@
+import contextlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from config import LEITURA_EM_BLOCOS, VALIDACAO_CPF
+from processamento.agrupamento import acumular_por_cpf, agrupar_por_cpf
+from processamento.cache import gravar_entrada_em_cache, ler_entrada_em_cache
+from processamento.contexto import ContextoArea, contexto_da_area
+from processamento.esquema import (
+    CPF,
+    VALOR,
+    EntradaTipada,
+    descrever_rejeitados,
+    formatar_cpf,
+    tipar_entrada,
+)
+from processamento.lancamentos import (
+    iterar_lancamentos,
+    montar_lancamentos,
+    montar_linha,
+)
+from processamento.paralelo import agrupar_em_paralelo, processos_para
+from processamento.perfil import etapa
+from processamento.progresso import avisar
+from processamento.regras import Regra
+from processamento.titulares import resolver_titulares
+from utils.escrita import salvar_rejeitados, salvar_saida
+from utils.helpers import (
+    FRACOES_POR_CENTAVO,
+    arredondar_centavos,
+    centavos_para_reais,
+    distribuir_centavos,
+    em_fracoes,
+    fracoes_para_reais,
+    truncar_centavos,
+)
+from utils.leitura import ler_planilha, ler_planilha_em_blocos
+from utils.log import escrever_no_log, obter_log
+
+
+def _coluna_cpf(regra: Regra, colunas):
+    if regra.cpf_sem_maiusculas:
+        candidatas = [coluna for coluna in colunas if coluna.lower() == "cpf"]
+    else:
+        candidatas = [coluna for coluna in colunas if coluna == "CPF"]
+    return candidatas[0] if candidatas else None
+
+
+def ler_entrada(regra: Regra, caminho, caminho_log) -> EntradaTipada | None:
+    """Lê a planilha de ``regra`` e a converte para o esquema tipado.
+
+    Retorna ``None`` (com aviso no log) se faltar a coluna de CPF ou de valor.
+    """
+    df = ler_planilha(
+        caminho,
+        colunas_lidas(regra),
+        dtype=str,
+        ignorar_maiusculas=regra.cpf_sem_maiusculas,
+    )
+    return preparar_entrada(regra, df, caminho_log)
+
+
+def colunas_lidas(regra: Regra) -> list[str]:
+    return ["CPF", "CPF_TITULAR", *regra.colunas_valor]
+
+
+def _colunas_entrada(regra: Regra, colunas, caminho_log):
+    """``(coluna de CPF, coluna de valor)`` ou ``None``, com aviso no log."""
+    cpf_coluna = _coluna_cpf(regra, colunas)
+    if cpf_coluna is None:
+        escrever_no_log("⚠️ Coluna 'CPF' não encontrada.", caminho_log, "AVISO")
+        return None
+    valor_col = next((c for c in regra.colunas_valor if c in colunas), None)
+    if valor_col is None:
+        escrever_no_log(
+            "⚠️ Nenhuma das colunas de valor esperadas "
+            f"({', '.join(regra.colunas_valor)}) foi encontrada.",
+            caminho_log,
+            "AVISO",
+        )
+        return None
+    return cpf_coluna, valor_col
+
+
+def preparar_entrada(regra: Regra, df, caminho_log) -> EntradaTipada | None:
+    """Confere as colunas de ``df`` (lido como texto) e o tipa conforme a regra."""
+    colunas = _colunas_entrada(regra, df.columns, caminho_log)
+    if colunas is None:
+        return None
+
+    if regra.remover_ultima_linha:
+        df = df.iloc[:-1]
+        escrever_no_log("📝 Última linha removida do DataFrame", caminho_log)
+    return tipar_entrada(df, *colunas, VALIDACAO_CPF["digitos_verificadores"])
+
+
+def _chave_leitura(regra: Regra) -> str:
+    """Campos da regra (e da validação) que mudam o resultado da leitura."""
+    return "|".join(
+        [
+            regra.tipo,
+            ",".join(regra.colunas_valor),
+            str(regra.cpf_sem_maiusculas),
+            str(regra.remover_ultima_linha),
+            str(VALIDACAO_CPF["digitos_verificadores"]),
+        ]
+    )
+
+
+def ler_entrada_com_cache(regra: Regra, caminho, caminho_log) -> EntradaTipada | None:
+    """``ler_entrada``, passando antes pelo cache da entrada tipada."""
+    chave = _chave_leitura(regra)
+    entrada = ler_entrada_em_cache(caminho, chave)
+    if entrada is not None:
+        escrever_no_log(
+            "♻️ Entrada lida do cache (planilha sem alterações)", caminho_log
+        )
+        return entrada
+    entrada = ler_entrada(regra, caminho, caminho_log)
+    if entrada is not None:
+        gravar_entrada_em_cache(caminho, chave, entrada)
+    return entrada
+
+
+def montar_planilha(regra: Regra, cpfs, somas, contexto: ContextoArea, caminho_log):
+    """Monta os lançamentos por CPF e as linhas finais (desconto e total).
+
+    ``somas`` é a soma de cada CPF em reais, como o pandas a calcula (veja
+    ``agrupar_por_cpf``). Data, documento e histórico vêm prontos em
+    ``contexto``. Retorna ``(planilha_final, linhas_finais)``: o
+    ``BlocoLancamentos`` dos CPFs e a lista de dicionários das linhas que vêm
+    depois dele.
+    """
+    # Truncamento e arredondamento seguem os processadores originais, sobre
+    # os mesmos floats, para que os totais não mudem. Com arredondar_soma_cpf,
+    # cada CPF é arredondado antes de aplicar fator_cpf; sem ele, o fator vale
+    # sobre a soma do CPF e o total não é arredondado.
+    somas = np.asarray(somas, dtype="float64")
+    if regra.arredondar_soma_cpf:
+        centavos_grupos = arredondar_centavos(somas)
+        somas = centavos_para_reais(centavos_grupos)
+        total = somas.sum()
+        total_fracoes = int(arredondar_centavos(total)) * FRACOES_POR_CENTAVO
+    else:
+        total = somas.sum()
+        # Só o ruído do float sai do total gravado (2465057.7600000002).
+        total_fracoes = int(em_fracoes(total))
+    centavos_cpfs = truncar_centavos(somas * regra.fator_cpf)
+    if regra.ajustar_centavos:
+        # Leva a soma dos CPFs ao valor ideal (adicionando ou subtraindo um
+        # centavo por CPF) e fecha o desconto pela diferença, para que
+        # CPFs + desconto = total. O ideal é o round() de antes, que no
+        # np.float64 é o np.round (escala por 100 e arredonda o float).
+        ideal = round(float(np.round(total * regra.fator_cpf, 2)) * 100)
+        centavos_cpfs, cpfs_ajustados = distribuir_centavos(centavos_cpfs, ideal)
+        if cpfs_ajustados:
+            acao = "adicionado" if cpfs_ajustados > 0 else "subtraído"
+            escrever_no_log(
+                f"🩹 Ajuste de truncamento: R$0.01 {acao} de {abs(cpfs_ajustados)} CPF(s) para compensar diferença.",
+                caminho_log,
+            )
+        desconto_fracoes = (
+            total_fracoes - int(centavos_cpfs.sum()) * FRACOES_POR_CENTAVO
+        )
+    else:
+        desconto_centavos = int(arredondar_centavos(total * (1 - regra.fator_cpf)))
+        desconto_fracoes = desconto_centavos * FRACOES_POR_CENTAVO
+
+    planilha_final = montar_lancamentos(
+        cpfs,
+        centavos_para_reais(centavos_cpfs),
+        {
+            "DATA DO LANCAMENTO": contexto.data_lancamento,
+            "DOCUMENTO": contexto.documento,
+            "CONTA CONTABIL": regra.conta_cpf,
+            "INDICADOR DE CONTA": "D",
+            "HISTORICO": contexto.historico,
+        },
+    )
+    sequencia = len(planilha_final) + 1
+
+    linhas_finais = []
+    if regra.linha_desconto is not None:
+        linhas_finais.append(
+            montar_linha(
+                {
+                    "DATA DO LANCAMENTO": contexto.data_lancamento,
+                    "DOCUMENTO": contexto.documento,
+                    "CONTA CONTABIL": regra.linha_desconto.conta,
+                    "INDICADOR DE CONTA": "D",
+                    "VALOR": float(fracoes_para_reais(desconto_fracoes)),
+                    "HISTORICO": contexto.historico,
+                    "CENTRO DE CUSTO": regra.linha_desconto.centro_custo,
+                    "SEQUENCIA": sequencia,
+                    "PROJETO": regra.linha_desconto.projeto,
+                }
+            )
+        )
+        sequencia += 1
+
+    linhas_finais.append(
+        montar_linha(
+            {
+                "DATA DO LANCAMENTO": contexto.data_lancamento,
+                "DOCUMENTO": contexto.documento,
+                "CONTA CONTABIL": regra.conta_total,
+                "INDICADOR DE CONTA": "C",
+                "VALOR": float(fracoes_para_reais(total_fracoes)),
+                "HISTORICO": contexto.historico,
+                "SEQUENCIA": sequencia,
+                "CLIENTE": regra.cliente_no_total,
+            }
+        )
+    )
+    escrever_no_log("📊 Adicionando linha de total", caminho_log)
+    return planilha_final, linhas_finais
+
+
+def _trocar_titulares(regra: Regra, df, log):
+    substituicao = resolver_titulares(
+        df,
+        CPF,
+        somente_se_diferente=regra.titular_somente_se_diferente,
+        tamanho_amostra=None if log.caminho_detalhes else 0,
+    )
+    log.registrar_eventos(
+        "cpf_titular",
+        substituicao.total,
+        (
+            f"{formatar_cpf(cpf)} → {formatar_cpf(titular)}"
+            for cpf, titular in substituicao.amostra
+        ),
+    )
+    return df.assign(**{CPF: substituicao.cpfs})
+
+
+def caminho_rejeitados(caminho_log) -> str:
+    """``logs/log_processamento_me202403.txt`` → ``..._me202403_rejeitados.csv``."""
+    return f"{os.path.splitext(os.fspath(caminho_log))[0]}_rejeitados.csv"
+
+
+def registrar_rejeitados(rejeitados: pd.DataFrame, caminho_log):
+    """Resume as células rejeitadas no log e grava a lista completa.
+
+    O relatório (``caminho_rejeitados``) é regravado a cada processamento e
+    apagado quando não há rejeições, para não sobrar o de uma execução antiga.
+    """
+    for mensagem in descrever_rejeitados(rejeitados):
+        escrever_no_log(mensagem, caminho_log, "AVISO")
+    caminho = caminho_rejeitados(caminho_log)
+    if len(rejeitados) and VALIDACAO_CPF["relatorio_rejeitados"]:
+        salvar_rejeitados(rejeitados, caminho, caminho_log)
+        escrever_no_log(f"📄 Células rejeitadas listadas em {caminho}", caminho_log)
+    else:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(caminho)
+
+
+def _em_reais(df):
+    """Linhas com CPF e valor, com o valor de volta ao float lido da planilha."""
+    df = df.dropna(subset=[CPF, VALOR])
+    return pd.DataFrame(
+        {
+            CPF: df[CPF].to_numpy("int64"),
+            VALOR: fracoes_para_reais(df[VALOR].to_numpy("int64")),
+        }
+    )
+
+
+def _somar_por_cpf(df, ordem):
+    return agrupar_por_cpf(_em_reais(df), CPF, VALOR, ordem=ordem)
+
+
+def agrupar_entrada(regra: Regra, entrada: EntradaTipada, caminho_log, progresso=None):
+    """Troca pelo CPF do titular e soma os valores (em reais) por CPF."""
+    registrar_rejeitados(entrada.rejeitados, caminho_log)
+    df = entrada.dados
+    if regra.exigir_cpf_proprio:
+        df = df.dropna(subset=[CPF])
+
+    log = obter_log(caminho_log)
+    processos = processos_para(len(df))
+    if processos > 1 and not log.caminho_detalhes:
+        return _agrupar_em_paralelo(regra, df, log, processos, progresso)
+
+    with etapa("titulares", len(df)) as medicao:
+        df = _trocar_titulares(regra, df, log)
+        medicao.linhas_saida = len(df)
+    log.resumir("cpf_titular", "🔄 {total} CPF(s) alterados para o CPF do titular")
+    avisar(progresso, "titulares", len(df))
+
+    with etapa("agrupamento", len(df)) as medicao:
+        df_agrupado = _somar_por_cpf(df, regra.ordem)
+        escrever_no_log("🧹 Linhas com CPF ou valor nulos removidas", caminho_log)
+        medicao.linhas_saida = len(df_agrupado)
+    avisar(progresso, "agrupamento", len(df_agrupado))
+    return df_agrupado
+
+
+def _agrupar_em_paralelo(regra: Regra, df, log, processos, progresso=None):
+    log.escrever(f"🧩 Troca pelo titular e soma por CPF em {processos} processos")
+    with etapa("agrupamento_paralelo", len(df)) as medicao:
+        df_agrupado, trocas = agrupar_em_paralelo(
+            df,
+            regra.ordem,
+            somente_se_diferente=regra.titular_somente_se_diferente,
+            processos=processos,
+        )
+        medicao.linhas_saida = len(df_agrupado)
+    log.registrar_eventos("cpf_titular", trocas)
+    log.resumir("cpf_titular", "🔄 {total} CPF(s) alterados para o CPF do titular")
+    log.escrever("🧹 Linhas com CPF ou valor nulos removidas")
+    avisar(progresso, "titulares", len(df))
+    avisar(progresso, "agrupamento", len(df_agrupado))
+    return df_agrupado
+
+
+def ler_em_blocos(caminho) -> bool:
+    """Se a planilha é grande o bastante para ``agrupar_em_blocos``."""
+    limite_mb = LEITURA_EM_BLOCOS["limite_mb"]
+    return limite_mb is not None and os.path.getsize(caminho) > limite_mb * 1e6
+
+
+def _sem_ultima_linha(blocos):
+    """Repassa os blocos segurando um, para descartar a última linha do último."""
+    anterior = None
+    for bloco in blocos:
+        if anterior is not None:
+            yield anterior
+        anterior = bloco
+    if anterior is not None:
+        yield anterior.iloc[:-1]
+
+
+def agrupar_em_blocos(regra: Regra, caminho, caminho_log, linhas_por_bloco=None):
+    """Lê, tipa e soma por CPF a planilha em blocos, sem carregá-la inteira.
+
+    Cada bloco passa pelas mesmas etapas de ``ler_entrada`` e
+    ``agrupar_entrada`` e os seus valores são somados por CPF aos dos blocos
+    anteriores com ``acumular_por_cpf``. A memória fica limitada ao tamanho do
+    bloco mais o número de CPFs distintos, e o resultado é o mesmo da leitura
+    completa. Retorna ``(df_agrupado, linhas lidas)`` ou ``None`` se faltar
+    alguma coluna.
+    """
+    blocos = ler_planilha_em_blocos(
+        caminho,
+        colunas_lidas(regra),
+        linhas_por_bloco or LEITURA_EM_BLOCOS["linhas_por_bloco"],
+        ignorar_maiusculas=regra.cpf_sem_maiusculas,
+    )
+    if regra.remover_ultima_linha:
+        blocos = _sem_ultima_linha(blocos)
+
+    log = obter_log(caminho_log)
+    colunas = None
+    acumulado = None
+    rejeitados = []
+    linhas = 0
+    for bloco in blocos:
+        if colunas is None:
+            colunas = _colunas_entrada(regra, bloco.columns, caminho_log)
+            if colunas is None:
+                blocos.close()
+                return None
+        linhas += len(bloco)
+        entrada = tipar_entrada(bloco, *colunas, VALIDACAO_CPF["digitos_verificadores"])
+        rejeitados.append(entrada.rejeitados)
+        df = entrada.dados
+        if regra.exigir_cpf_proprio:
+            df = df.dropna(subset=[CPF])
+        acumulado = acumular_por_cpf(
+            acumulado, _em_reais(_trocar_titulares(regra, df, log)), CPF, VALOR
+        )
+
+    if regra.remover_ultima_linha:
+        escrever_no_log("📝 Última linha removida do DataFrame", caminho_log)
+    registrar_rejeitados(pd.concat(rejeitados, ignore_index=True), caminho_log)
+    log.resumir("cpf_titular", "🔄 {total} CPF(s) alterados para o CPF do titular")
+    escrever_no_log("🧹 Linhas com CPF ou valor nulos removidas", caminho_log)
+    return (
+        agrupar_por_cpf(acumulado[[CPF, VALOR]], CPF, VALOR, ordem=regra.ordem),
+        linhas,
+    )
+
+
+def lancar_area(
+    regra: Regra, df_agrupado, contexto: ContextoArea, caminho_log, progresso=None
+):
+    """Lançamentos por CPF (``fator_cpf`` do valor), desconto e total.
+
+    Retorna o mesmo par de ``montar_planilha``.
+    """
+    with etapa("lancamentos", len(df_agrupado)) as medicao:
+        planilha_final, linhas_finais = montar_planilha(
+            regra,
+            df_agrupado[CPF],
+            df_agrupado[VALOR],
+            contexto,
+            caminho_log,
+        )
+        medicao.linhas_saida = len(planilha_final) + len(linhas_finais)
+    avisar(progresso, "lancamentos", medicao.linhas_saida)
+    return planilha_final, linhas_finais
+
+
+def gerar_lancamentos(
+    regra: Regra,
+    entrada: EntradaTipada,
+    contexto: ContextoArea,
+    caminho_log,
+    progresso=None,
+):
+    """Da entrada tipada aos lançamentos de uma área, sem gravar nada.
+
+    ``agrupar_entrada`` seguido de ``lancar_area``.
+    """
+    df_agrupado = agrupar_entrada(regra, entrada, caminho_log, progresso)
+    return lancar_area(regra, df_agrupado, contexto, caminho_log, progresso)
+
+
+def processar_area(
+    regra: Regra,
+    caminho,
+    caminho_saida,
+    codigo_al,
+    caminho_log,
+    contexto=None,
+    progresso=None,
+):
+    """Gera a planilha de importação de uma área conforme a sua ``Regra``.
+
+    Lê a entrada (ou o cache da entrada tipada) e a agrupa por CPF, ou faz as
+    duas coisas em blocos se a planilha passar de
+    ``LEITURA_EM_BLOCOS["limite_mb"]``; depois monta os lançamentos e os grava
+    em ``caminho_saida``. ``contexto`` é o da execução ou o já pronto para a
+    área (veja ``processamento.contexto``); sem ele, vale o mês anterior.
+    """
+    tipo = regra.tipo
+    contexto = contexto_da_area(regra, codigo_al, contexto)
+    escrever_no_log(f"🔹 Iniciando processamento do arquivo {tipo}...", caminho_log)
+    if ler_em_blocos(caminho):
+        escrever_no_log(
+            "🧱 Planilha grande: leitura e soma por CPF em blocos", caminho_log
+        )
+        with etapa("leitura_em_blocos") as medicao:
+            resultado = agrupar_em_blocos(regra, caminho, caminho_log)
+            if resultado is None:
+                return
+            df_agrupado, linhas = resultado
+            medicao.linhas_entrada = linhas
+            medicao.linhas_saida = len(df_agrupado)
+        avisar(progresso, "leitura", linhas)
+        avisar(progresso, "titulares", linhas)
+        avisar(progresso, "agrupamento", len(df_agrupado))
+    else:
+        with etapa("leitura") as medicao:
+            entrada = ler_entrada_com_cache(regra, caminho, caminho_log)
+            if entrada is None:
+                return
+            medicao.linhas_saida = len(entrada.dados)
+        avisar(progresso, "leitura", len(entrada.dados))
+        df_agrupado = agrupar_entrada(regra, entrada, caminho_log, progresso)
+
+    planilha_final, linhas_finais = lancar_area(
+        regra, df_agrupado, contexto, caminho_log, progresso
+    )
+    total_lancamentos = len(planilha_final) + len(linhas_finais)
+    with etapa("escrita", total_lancamentos) as medicao:
+        linhas = iterar_lancamentos(planilha_final, linhas_finais)
+        salvar_saida(linhas, caminho_saida, caminho_log)
+        medicao.linhas_saida = total_lancamentos
+    escrever_no_log(
+        f"✅ Arquivo {tipo} gerado com sucesso: {caminho_saida}", caminho_log
+    )
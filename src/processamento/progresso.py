@@ -0,0 +1,37 @@
+from typing import NamedTuple
+
+# Etapas reportadas por cada processador ao terminá-las, na ordem em que
+# acontecem; "concluido" é publicado pela execução depois da gravação.
+ETAPAS = ("leitura", "titulares", "agrupamento", "lancamentos", "concluido")
+
+
+class EventoProgresso(NamedTuple):
+    arquivo: str
+    etapa: str
+    linhas: int | None = None
+
+
+class ProcessamentoCancelado(Exception):
+    pass
+
+
+def criar_notificador(arquivo, fila=None, cancelamento=None):
+    """Cria o callback ``progresso(etapa, linhas)`` passado aos processadores.
+
+    A cada etapa o callback publica um ``EventoProgresso`` em ``fila`` (qualquer
+    objeto com ``put``) e, se ``cancelamento`` (com ``is_set``) estiver ligado,
+    interrompe o processamento com ``ProcessamentoCancelado``.
+    """
+
+    def progresso(etapa, linhas=None):
+        if cancelamento is not None and cancelamento.is_set():
+            raise ProcessamentoCancelado(f"{arquivo}: cancelado antes de '{etapa}'")
+        if fila is not None:
+            fila.put(EventoProgresso(arquivo, etapa, linhas))
+
+    return progresso
+
+
+def avisar(progresso, etapa, linhas=None):
+    if progresso is not None:
+        progresso(etapa, linhas)
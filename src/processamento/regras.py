@@ -0,0 +1,131 @@
+from typing import NamedTuple
+
+from config import REGRAS_AREAS
+from processamento.agrupamento import ORDEM_CPF, ORDEM_PRIMEIRA_OCORRENCIA
+
+
+class LinhaDesconto(NamedTuple):
+    conta: str
+    centro_custo: str = ""
+    projeto: str = ""
+
+
+class Regra(NamedTuple):
+    tipo: str
+    area: str
+    colunas_valor: tuple[str, ...]
+    fator_cpf: float
+    conta_cpf: str
+    conta_total: str
+    prefixo_historico: str = ""
+    remover_ultima_linha: bool = False
+    cpf_sem_maiusculas: bool = False
+    exigir_cpf_proprio: bool = False
+    titular_somente_se_diferente: bool = False
+    ordem: str = ORDEM_PRIMEIRA_OCORRENCIA
+    ajustar_centavos: bool = False
+    arredondar_soma_cpf: bool = True
+    linha_desconto: LinhaDesconto | None = None
+    cliente_no_total: str | None = None
+
+    @property
+    def arquivo(self) -> str:
+        return f"{self.tipo}.xlsx"
+
+
+_OBRIGATORIAS = {"area", "colunas_valor", "fator_cpf", "conta_cpf", "conta_total"}
+_BOOLEANAS = {
+    "remover_ultima_linha",
+    "cpf_sem_maiusculas",
+    "exigir_cpf_proprio",
+    "titular_somente_se_diferente",
+    "ajustar_centavos",
+    "arredondar_soma_cpf",
+}
+
+
+def _erros_da_regra(tipo, campos) -> list[str]:
+    erros = []
+    if not (isinstance(tipo, str) and tipo.isalnum() and tipo.isupper()):
+        erros.append("o tipo deve ser um código em maiúsculas, ex.: 'ME'")
+    if not isinstance(campos, dict):
+        return erros + ["a regra deve ser um dicionário"]
+
+    desconhecidas = set(campos) - (set(Regra._fields) - {"tipo"})
+    if desconhecidas:
+        erros.append(f"chaves desconhecidas: {sorted(desconhecidas)}")
+    faltando = _OBRIGATORIAS - set(campos)
+    if faltando:
+        erros.append(f"chaves obrigatórias ausentes: {sorted(faltando)}")
+
+    colunas = campos.get("colunas_valor", [])
+    if (
+        isinstance(colunas, str)
+        or not colunas
+        or not all(isinstance(c, str) and c for c in colunas)
+    ):
+        erros.append("colunas_valor deve ser uma lista não vazia de nomes")
+
+    for chave in _BOOLEANAS & set(campos):
+        if not isinstance(campos[chave], bool):
+            erros.append(f"{chave} deve ser True ou False")
+
+    if campos.get("ordem", ORDEM_PRIMEIRA_OCORRENCIA) not in (
+        ORDEM_PRIMEIRA_OCORRENCIA,
+        ORDEM_CPF,
+    ):
+        erros.append(f"ordem deve ser '{ORDEM_PRIMEIRA_OCORRENCIA}' ou '{ORDEM_CPF}'")
+
+    contas = [campos.get("conta_cpf"), campos.get("conta_total")]
+    desconto = campos.get("linha_desconto")
+    if desconto is not None:
+        if not isinstance(desconto, dict) or "conta" not in desconto:
+            erros.append("linha_desconto deve ter ao menos a chave 'conta'")
+        else:
+            extras = set(desconto) - set(LinhaDesconto._fields)
+            if extras:
+                erros.append(
+                    f"linha_desconto com chaves desconhecidas: {sorted(extras)}"
+                )
+            contas.append(desconto["conta"])
+    for conta in contas:
+        if conta is not None and not (isinstance(conta, str) and conta.isdigit()):
+            erros.append(f"conta contábil inválida: {conta!r}")
+
+    fator = campos.get("fator_cpf")
+    if fator is not None:
+        if isinstance(fator, bool) or not isinstance(fator, (int, float)):
+            erros.append("fator_cpf deve ser numérico")
+        elif not 0 < fator <= 1:
+            erros.append("fator_cpf deve estar entre 0 (exclusive) e 1")
+        elif fator < 1 and desconto is None:
+            erros.append("fator_cpf menor que 1 exige linha_desconto")
+        elif fator == 1 and desconto is not None:
+            erros.append("linha_desconto só faz sentido com fator_cpf menor que 1")
+    if campos.get("ajustar_centavos") and desconto is None:
+        erros.append("ajustar_centavos exige linha_desconto")
+    return erros
+
+
+def compilar_regras(regras=None) -> dict[str, Regra]:
+    """Valida a tabela de regras e a converte em ``Regra``, uma vez por execução.
+
+    Todos os problemas encontrados são reunidos num único ``ValueError``.
+    """
+    regras = REGRAS_AREAS if regras is None else regras
+    erros = [
+        f"Regra '{tipo}': {erro}"
+        for tipo, campos in regras.items()
+        for erro in _erros_da_regra(tipo, campos)
+    ]
+    if erros:
+        raise ValueError("Tabela de regras inválida:\n" + "\n".join(erros))
+
+    compiladas = {}
+    for tipo, campos in regras.items():
+        campos = dict(campos)
+        campos["colunas_valor"] = tuple(campos["colunas_valor"])
+        if campos.get("linha_desconto") is not None:
+            campos["linha_desconto"] = LinhaDesconto(**campos["linha_desconto"])
+        compiladas[tipo] = Regra(tipo=tipo, **campos)
+    return compiladas
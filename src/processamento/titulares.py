@@ -0,0 +1,46 @@
+from typing import NamedTuple
+
+import pandas as pd
+
+
+class Substituicao(NamedTuple):
+    cpfs: pd.Series
+    total: int
+    amostra: list
+
+
+def resolver_titulares(
+    df: pd.DataFrame,
+    coluna_cpf="CPF",
+    coluna_titular="CPF_TITULAR",
+    somente_se_diferente=False,
+    tamanho_amostra=0,
+) -> Substituicao:
+    """Troca o CPF pelo CPF_TITULAR, quando houver, numa única operação de coluna.
+
+    Com ``somente_se_diferente`` (regra do OD) a troca só acontece quando o
+    titular difere do CPF. ``total`` conta as linhas cujo CPF de fato mudou e
+    ``amostra`` traz até ``tamanho_amostra`` pares ``(cpf, titular)`` para o log
+    (``None`` traz todos). Sem a coluna de titular, os CPFs voltam inalterados.
+    """
+    cpfs = df[coluna_cpf]
+    if coluna_titular not in df.columns:
+        return Substituicao(cpfs, 0, [])
+
+    titulares = df[coluna_titular]
+    # Com colunas Int64, comparar com nulo dá <NA>; nulo conta como diferente.
+    diferentes = (titulares != cpfs).fillna(True).astype(bool)
+    trocar = titulares.notna()
+    if somente_se_diferente:
+        trocar &= diferentes
+    resolvidos = cpfs.where(~trocar, titulares)
+
+    alterados = trocar & diferentes
+    total = int(alterados.sum())
+    amostra = []
+    if tamanho_amostra != 0 and total:
+        selecao = df.loc[alterados, [coluna_cpf, coluna_titular]]
+        if tamanho_amostra is not None:
+            selecao = selecao.head(tamanho_amostra)
+        amostra = list(selecao.itertuples(index=False, name=None))
+    return Substituicao(resolvidos, total, amostra)
@@ -0,0 +1,107 @@
+"""CPFs em arrays do NumPy: conversão de texto e dígitos verificadores.
+
+Os CPFs são inteiros de até 11 dígitos, como no esquema tipado: zeros à
+esquerda perdidos pelo Excel não mudam o número. As contas são feitas
+caractere a caractere (ou dígito a dígito) sobre o array inteiro, sem laço
+por linha.
+"""
+
+import numpy as np
+
+# Todos os dígitos iguais (000.000.000-00, 111.111.111-11...): passam na conta
+# dos verificadores, mas não são CPFs válidos.
+REPETIDOS = 11_111_111_111
+LIMITE_CPF = 10**11
+DIGITOS_CPF = 11
+# Formato pontuado reconhecido sem passar por expressões regulares.
+MASCARA = "000.000.000-00"
+
+
+def cpfs_de_textos(textos) -> tuple[np.ndarray, np.ndarray]:
+    """Converte os CPFs em texto que estão só em dígitos ou na ``MASCARA``.
+
+    Só dígitos: de 1 a 11, sem nada em volta (os zeros à esquerda podem
+    faltar). Os textos viram uma matriz de códigos de caractere com uma linha
+    por posição, e o número é montado posição a posição. Retorna os números
+    (0 onde não houve conversão) e a máscara dos convertidos; nulos e outros
+    formatos ficam de fora, para quem chamou tratar.
+    """
+    textos = np.asarray(textos, dtype=object)
+    # Um caractere a mais que a máscara: textos longos são cortados pelo
+    # astype, mas continuam reconhecíveis pelo comprimento.
+    largura = len(MASCARA) + 1
+    try:
+        codigos = textos.astype(f"S{largura}").view(np.uint8)
+    except UnicodeEncodeError:
+        codigos = textos.astype(f"U{largura}").view(np.uint32)
+    posicoes = np.ascontiguousarray(codigos.reshape(len(textos), largura).T)
+
+    numeros = np.zeros(len(textos), dtype="int64")
+    comprimentos = np.zeros(len(textos), dtype="int64")
+    so_digitos = np.ones(len(textos), dtype=bool)
+    anterior = so_digitos.copy()
+    for codigo in posicoes:
+        # Posições vazias valem 0 e, como ficam à direita, saem na divisão
+        # abaixo; um "\x00" no meio do texto não passa.
+        preenchido = codigo != 0
+        digito = (codigo - ord("0")) * preenchido
+        so_digitos &= (digito <= 9) & (anterior | ~preenchido)
+        anterior = preenchido
+        comprimentos += preenchido
+        numeros *= 10
+        numeros += digito
+    so_digitos &= (comprimentos >= 1) & (comprimentos <= DIGITOS_CPF)
+    numeros //= 10 ** (largura - comprimentos)
+    numeros[~so_digitos] = 0
+
+    candidatos = np.flatnonzero(comprimentos == len(MASCARA))
+    if len(candidatos):
+        trechos = posicoes[:, candidatos]
+        na_mascara = np.ones(len(candidatos), dtype=bool)
+        mascarados = np.zeros(len(candidatos), dtype="int64")
+        for codigo, caractere in zip(trechos, MASCARA):
+            if caractere == "0":
+                digito = codigo - ord("0")
+                na_mascara &= digito <= 9
+                mascarados = mascarados * 10 + digito
+            else:
+                na_mascara &= codigo == ord(caractere)
+        linhas = candidatos[na_mascara]
+        numeros[linhas] = mascarados[na_mascara]
+        so_digitos[linhas] = True
+    return numeros, so_digitos
+
+
+def digitos_verificadores(bases) -> np.ndarray:
+    """Os dois verificadores (de 0 a 99) de cada base de 9 dígitos."""
+    restante = np.asarray(bases, dtype="int64").astype("int32")
+    soma1 = np.zeros(len(restante), dtype="int32")
+    soma2 = np.zeros(len(restante), dtype="int32")
+    # Do último dígito da base para o primeiro: pesos 2 a 10 no primeiro
+    # verificador e 3 a 11 no segundo.
+    for peso in range(2, 11):
+        digito = restante % 10
+        restante //= 10
+        soma1 += digito * peso
+        soma2 += digito * (peso + 1)
+    primeiro = soma1 * 10 % 11 % 10
+    segundo = (soma2 + primeiro * 2) * 10 % 11 % 10
+    return (primeiro * 10 + segundo).astype("int64")
+
+
+def completar_cpfs(bases) -> np.ndarray:
+    """CPFs (``int64``) formados pelas bases de 9 dígitos e seus verificadores."""
+    bases = np.asarray(bases, dtype="int64")
+    return bases * 100 + digitos_verificadores(bases)
+
+
+def cpfs_validos(cpfs) -> np.ndarray:
+    """Máscara dos CPFs cujos dois dígitos verificadores conferem."""
+    cpfs = np.asarray(cpfs, dtype="int64")
+    no_intervalo = (cpfs >= 0) & (cpfs < LIMITE_CPF)
+    cpfs = np.where(no_intervalo, cpfs, 0)
+    return (
+        no_intervalo
+        & (cpfs % REPETIDOS != 0)
+        & (digitos_verificadores(cpfs // 100) == cpfs % 100)
+    )
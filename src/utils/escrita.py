@@ -0,0 +1,222 @@
+import contextlib
+import csv
+import math
+import os
+
+import xlsxwriter
+
+from config import SAIDA_TEXTO, TEMPLATE_IMPORTACAO_BASE
+from utils.log import escrever_no_log
+
+# Buffer de escrita dos formatos de texto: poucas chamadas ao sistema mesmo
+# com centenas de milhares de linhas.
+TAMANHO_BUFFER = 1024 * 1024
+COLUNAS_NUMERICAS = ("VALOR", "SEQUENCIA")
+# Relatórios podem trazer o conteúdo original das células, com qualquer
+# caractere; o BOM faz o Excel abri-los como UTF-8.
+CODIFICACAO_RELATORIOS = "utf-8-sig"
+
+
+def _vazio(valor) -> bool:
+    if isinstance(valor, float):
+        return math.isnan(valor)
+    return valor is None or valor == ""
+
+
+def _escrever_aba(workbook, nome, linhas):
+    colunas = list(TEMPLATE_IMPORTACAO_BASE)
+    planilha = workbook.add_worksheet(nome)
+    # Mesmo estilo de cabeçalho que o pandas usava no to_excel
+    cabecalho = workbook.add_format(
+        {"bold": True, "border": 1, "align": "center", "valign": "top"}
+    )
+    planilha.write_row(0, 0, colunas, cabecalho)
+
+    for numero_linha, linha in enumerate(linhas, start=1):
+        for numero_coluna, valor in enumerate(linha):
+            if _vazio(valor):
+                continue
+            if isinstance(valor, str):
+                planilha.write_string(numero_linha, numero_coluna, valor)
+            else:
+                planilha.write_number(numero_linha, numero_coluna, valor)
+
+
+def salvar_excel_formatado(linhas, caminho_saida, caminho_log):
+    """Grava as linhas de importação direto no xlsx, em streaming.
+
+    ``linhas`` é qualquer iterável (de preferência um gerador) de tuplas na
+    ordem das colunas de ``TEMPLATE_IMPORTACAO_BASE``. Com ``constant_memory``
+    o xlsxwriter descarta cada linha assim que ela é escrita, então o consumo
+    de memória não cresce com o número de CPFs.
+    """
+    try:
+        workbook = xlsxwriter.Workbook(caminho_saida, {"constant_memory": True})
+        _escrever_aba(workbook, "Sheet1", linhas)
+        workbook.close()
+    except Exception as e:
+        escrever_no_log(
+            f"⚠️ Erro ao salvar o arquivo {caminho_saida}: {e}", caminho_log, "ERRO"
+        )
+
+
+def salvar_excel_abas(abas: dict, caminho_saida, caminho_log) -> bool:
+    """Grava várias planilhas de importação como abas de um único xlsx.
+
+    ``abas`` mapeia o nome da aba para as linhas, como em
+    ``salvar_excel_formatado``. As abas são escritas uma após a outra (com
+    ``constant_memory`` uma aba não pode ser retomada depois da seguinte) e o
+    arquivo é fechado uma vez só. Retorna ``False`` se a gravação falhar.
+    """
+    try:
+        workbook = xlsxwriter.Workbook(caminho_saida, {"constant_memory": True})
+        for nome, linhas in abas.items():
+            _escrever_aba(workbook, nome, linhas)
+        workbook.close()
+    except Exception as e:
+        escrever_no_log(
+            f"⚠️ Erro ao salvar o arquivo {caminho_saida}: {e}", caminho_log, "ERRO"
+        )
+        return False
+    return True
+
+
+def salvar_saida(linhas, caminho_saida, caminho_log):
+    """Grava as linhas no formato indicado pela extensão de ``caminho_saida``.
+
+    ``.csv`` gera texto delimitado, ``.txt`` largura fixa e qualquer outra
+    extensão o xlsx de ``salvar_excel_formatado``.
+    """
+    extensao = os.path.splitext(os.fspath(caminho_saida))[1].lower()
+    if extensao == ".csv":
+        salvar_texto_delimitado(linhas, caminho_saida, caminho_log)
+    elif extensao == ".txt":
+        salvar_texto_largura_fixa(linhas, caminho_saida, caminho_log)
+    else:
+        salvar_excel_formatado(linhas, caminho_saida, caminho_log)
+
+
+def _formatadores(separador_decimal):
+    """Uma função por coluna do template que converte o valor em texto."""
+
+    def texto(valor):
+        if _vazio(valor):
+            return ""
+        if isinstance(valor, float) and valor.is_integer():
+            return str(int(valor))
+        return str(valor)
+
+    def dinheiro(valor):
+        if _vazio(valor):
+            return ""
+        return f"{valor:.2f}".replace(".", separador_decimal)
+
+    return [
+        dinheiro if coluna == "VALOR" else texto for coluna in TEMPLATE_IMPORTACAO_BASE
+    ]
+
+
+@contextlib.contextmanager
+def _arquivo_texto(caminho_saida, codificacao):
+    """Abre um temporário ao lado da saída e só o renomeia se tudo der certo."""
+    temporario = f"{os.fspath(caminho_saida)}.tmp"
+    try:
+        with open(
+            temporario,
+            "w",
+            encoding=codificacao,
+            newline="",
+            buffering=TAMANHO_BUFFER,
+        ) as arquivo:
+            yield arquivo
+        os.replace(temporario, caminho_saida)
+    finally:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(temporario)
+
+
+def salvar_texto_delimitado(
+    linhas, caminho_saida, caminho_log, configuracao=SAIDA_TEXTO
+):
+    """Grava as linhas de importação como texto delimitado (``SAIDA_TEXTO``)."""
+    formatadores = _formatadores(configuracao["separador_decimal"])
+    try:
+        with _arquivo_texto(caminho_saida, configuracao["codificacao"]) as arquivo:
+            escritor = csv.writer(
+                arquivo,
+                delimiter=configuracao["delimitador"],
+                lineterminator=configuracao["fim_de_linha"],
+            )
+            if configuracao["cabecalho_csv"]:
+                escritor.writerow(TEMPLATE_IMPORTACAO_BASE)
+            escritor.writerows(
+                [formatar(valor) for formatar, valor in zip(formatadores, linha)]
+                for linha in linhas
+            )
+    except Exception as e:
+        escrever_no_log(
+            f"⚠️ Erro ao salvar o arquivo {caminho_saida}: {e}", caminho_log, "ERRO"
+        )
+
+
+def salvar_texto_largura_fixa(
+    linhas, caminho_saida, caminho_log, configuracao=SAIDA_TEXTO
+):
+    """Grava as linhas de importação em largura fixa (``SAIDA_TEXTO``).
+
+    Um campo maior que a sua largura interrompe a gravação com erro no log,
+    em vez de ser cortado.
+    """
+    formatadores = _formatadores(configuracao["separador_decimal"])
+    larguras = [configuracao["larguras"][coluna] for coluna in TEMPLATE_IMPORTACAO_BASE]
+    alinhamentos = [
+        str.rjust if coluna in COLUNAS_NUMERICAS else str.ljust
+        for coluna in TEMPLATE_IMPORTACAO_BASE
+    ]
+    campos = list(zip(TEMPLATE_IMPORTACAO_BASE, formatadores, larguras, alinhamentos))
+    fim_de_linha = configuracao["fim_de_linha"]
+
+    def formatar_linha(numero, linha):
+        partes = []
+        for (coluna, formatar, largura, alinhar), valor in zip(campos, linha):
+            texto = formatar(valor)
+            if len(texto) > largura:
+                raise ValueError(
+                    f"linha {numero}: {coluna} com {len(texto)} caracteres "
+                    f"(máximo {largura}): {texto!r}"
+                )
+            partes.append(alinhar(texto, largura))
+        partes.append(fim_de_linha)
+        return "".join(partes)
+
+    try:
+        with _arquivo_texto(caminho_saida, configuracao["codificacao"]) as arquivo:
+            arquivo.writelines(
+                formatar_linha(numero, linha)
+                for numero, linha in enumerate(linhas, start=1)
+            )
+    except Exception as e:
+        escrever_no_log(
+            f"⚠️ Erro ao salvar o arquivo {caminho_saida}: {e}", caminho_log, "ERRO"
+        )
+
+
+def salvar_rejeitados(rejeitados, caminho_saida, caminho_log, configuracao=SAIDA_TEXTO):
+    """Grava as células rejeitadas (um DataFrame) como texto delimitado.
+
+    Usa o delimitador e o fim de linha de ``SAIDA_TEXTO``, mas sempre em
+    ``CODIFICACAO_RELATORIOS``.
+    """
+    try:
+        with _arquivo_texto(caminho_saida, CODIFICACAO_RELATORIOS) as arquivo:
+            escritor = csv.writer(
+                arquivo,
+                delimiter=configuracao["delimitador"],
+                lineterminator=configuracao["fim_de_linha"],
+            )
+            escritor.writerow(rejeitados.columns)
+            escritor.writerows(rejeitados.itertuples(index=False, name=None))
+    except Exception as e:
+        escrever_no_log(
+            f"⚠️ Erro ao salvar o arquivo {caminho_saida}: {e}", caminho_log, "ERRO"
+        )
@@ -1,27 +1,89 @@
 import datetime
-import tkinter as tk
 from decimal import ROUND_HALF_UP, Decimal
 
-import customtkinter as ctk
+import numpy as np
 
+# Os valores lidos ficam em frações de centavo (int64), que guardam sem perda
+# qualquer valor com até seis casas. As somas por CPF voltam ao float, como o
+# pandas as calcula, e o truncamento e o arredondamento seguem as regras dos
+# processadores originais sobre esse float: os totais não mudam. Só o ruído
+# do float (1232528.880000001) sai das linhas finais gravadas.
+FRACOES_POR_CENTAVO = 10_000
+CENTAVO = Decimal("0.01")
 
-def truncar_se_mais_de_duas_casas(valor, acumulador):
-    partes = str(valor).split(".")
-    if len(partes) == 2 and len(partes[1]) > 2:
-        truncado = int(valor * 100) / 100
-        acumulador["truncado"] += valor - truncado
-        return truncado
-    return valor
 
+def em_fracoes(valores) -> np.ndarray:
+    """Converte valores em reais para frações de centavo (int64)."""
+    escala = 100 * FRACOES_POR_CENTAVO
+    return np.rint(np.asarray(valores, dtype="float64") * escala).astype("int64")
 
-def arredondar(valor):
-    return float(Decimal(valor).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP))
 
+def fracoes_para_reais(fracoes) -> np.ndarray:
+    """Frações de centavo para o float mais próximo do valor em reais."""
+    return np.asarray(fracoes, dtype="int64") / (100 * FRACOES_POR_CENTAVO)
 
-def ultimo_dia_mes_anterior():
-    hoje = datetime.datetime.now()
-    primeiro_dia_mes = datetime.datetime(hoje.year, hoje.month, 1)
-    ultimo_dia = primeiro_dia_mes - datetime.timedelta(days=1)
+
+def arredondar_fracoes(fracoes) -> np.ndarray:
+    """Frações de centavo para centavos (int64) com ROUND_HALF_UP."""
+    fracoes = np.asarray(fracoes, dtype="int64")
+    meio = FRACOES_POR_CENTAVO // 2
+    return np.sign(fracoes) * ((np.abs(fracoes) + meio) // FRACOES_POR_CENTAVO)
+
+
+def truncar_centavos(valores) -> np.ndarray:
+    """Converte valores em reais para centavos (int64), descartando o excedente.
+
+    Como o antigo ``truncar_se_mais_de_duas_casas``: um float que já é um
+    valor em centavos (repr com até duas casas, como 0.29) fica como está; os
+    demais viram ``int(valor * 100)``, sobre o float.
+    """
+    valores = np.asarray(valores, dtype="float64")
+    centavos = np.rint(valores * 100)
+    truncados = np.trunc(valores * 100)
+    return np.where(centavos / 100 == valores, centavos, truncados).astype("int64")
+
+
+def arredondar_centavos(valores) -> np.ndarray:
+    """Converte valores em reais para centavos (int64) com ROUND_HALF_UP.
+
+    Como o antigo ``arredondar``, vale o valor binário do float: 2.675 está
+    guardado como 2.67499999... e vira 2.67. Só os valores a menos de meia
+    fração de um empate dependem disso e passam pelo ``Decimal``.
+    """
+    valores = np.asarray(valores, dtype="float64")
+    fracoes = em_fracoes(valores)
+    centavos = arredondar_fracoes(fracoes)
+    empates = np.abs(fracoes) % FRACOES_POR_CENTAVO == FRACOES_POR_CENTAVO // 2
+    for i in np.flatnonzero(empates):
+        valor = Decimal(float(valores.flat[i])).quantize(CENTAVO, ROUND_HALF_UP)
+        centavos.flat[i] = int(valor * 100)
+    return centavos
+
+
+def centavos_para_reais(centavos) -> np.ndarray:
+    return np.asarray(centavos, dtype="int64") / 100
+
+
+def distribuir_centavos(centavos, alvo: int) -> tuple[np.ndarray, int]:
+    """Distribui a diferença entre ``alvo`` e a soma de ``centavos``.
+
+    Soma (ou subtrai) um centavo de cada linha, a partir da primeira, até
+    cobrir a diferença. Retorna os centavos ajustados e quantas linhas foram
+    alteradas, com sinal indicando a direção do ajuste.
+    """
+    centavos = np.array(centavos, dtype="int64")
+    diferenca = int(alvo) - int(centavos.sum())
+    ajustados = min(abs(diferenca), len(centavos))
+    direcao = 1 if diferenca > 0 else -1
+    centavos[:ajustados] += direcao
+    return centavos, ajustados * direcao
+
+
+def ultimo_dia_mes_anterior(ano_mes=None):
+    ano_mes = ano_mes or ano_mes_anterior()
+    ano, mes = int(ano_mes[:4]), int(ano_mes[4:])
+    primeiro_dia_mes_seguinte = datetime.datetime(ano + mes // 12, mes % 12 + 1, 1)
+    ultimo_dia = primeiro_dia_mes_seguinte - datetime.timedelta(days=1)
     return ultimo_dia.strftime("%Y%m%d")
 
 
@@ -32,82 +94,11 @@ def ano_mes_anterior():
     return f"{ano}{mes:02d}"
 
 
-def nome_documento(tipo: str) -> str:
-    hoje = datetime.datetime.now()
-    mes = hoje.month - 1 or 12
-    ano = hoje.year if hoje.month > 1 else hoje.year - 1
-    return f"{tipo.upper()}{mes:02d}{ano % 100:02d}"
+def nome_documento(tipo: str, ano_mes=None) -> str:
+    ano_mes = ano_mes or ano_mes_anterior()
+    return f"{tipo.upper()}{ano_mes[4:]}{ano_mes[2:4]}"
 
 
-def formatar_historico(codigo_al, area):
-    ano_mes = ano_mes_anterior()
+def formatar_historico(codigo_al, area, ano_mes=None):
+    ano_mes = ano_mes or ano_mes_anterior()
     return f"{area} ({codigo_al} SESC) {ano_mes[4:]}/{ano_mes[:4]}"
-
-
-import customtkinter as ctk
-
-
-def pedir_codigo_al(arquivo):
-    class DialogCodigoAL(ctk.CTkToplevel):
-        def __init__(self, parent, arquivo):
-            super().__init__(parent)
-            self.title("Código AL")
-            self.geometry("360x180")
-            self.resizable(False, False)
-            self.transient(parent)
-            self.grab_set()
-            self.codigo = None
-
-            self.label = ctk.CTkLabel(
-                self, text=f"Digite o código AL para o arquivo {arquivo}:"
-            )
-            self.label.pack(pady=(20, 12), padx=20)
-
-            self.entry = ctk.CTkEntry(self, width=320)
-            self.entry.pack(pady=(0, 12), padx=20)
-            self.entry.focus()
-
-            self.lbl_aviso = ctk.CTkLabel(self, text="", text_color="red")
-            self.lbl_aviso.pack(pady=(0, 10), padx=20)
-
-            frame_botoes = ctk.CTkFrame(self, fg_color="transparent")
-            frame_botoes.pack(pady=5, padx=20, fill="x")
-
-            btn_ok = ctk.CTkButton(
-                frame_botoes, text="OK", width=140, command=self.on_ok
-            )
-            btn_ok.pack(side="left", padx=(0, 15))
-
-            btn_cancel = ctk.CTkButton(
-                frame_botoes, text="Cancelar", width=140, command=self.on_cancel
-            )
-            btn_cancel.pack(side="left")
-
-            self.protocol("WM_DELETE_WINDOW", self.on_cancel)
-
-        def on_ok(self):
-            valor = self.entry.get().strip()
-            if not valor:
-                self.lbl_aviso.configure(text="⚠️ Código AL inválido. Tente novamente.")
-                return
-            valor_upper = valor.upper()
-            if valor_upper.startswith("AL "):
-                self.codigo = valor
-            elif valor_upper.startswith("AL"):
-                self.codigo = "AL " + valor[2:].strip()
-            else:
-                self.codigo = "AL " + valor
-            self.destroy()
-
-        def on_cancel(self):
-            self.codigo = None
-            self.destroy()
-
-    root = ctk.CTk()
-    root.withdraw()
-
-    dialog = DialogCodigoAL(root, arquivo)
-    root.wait_window(dialog)
-
-    root.destroy()
-    return dialog.codigo
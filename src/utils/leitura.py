@@ -0,0 +1,207 @@
+import importlib.util
+import math
+
+import pandas as pd
+
+from config import MOTOR_LEITURA
+
+# Ordem de preferência quando MOTOR_LEITURA = "auto". O calamine (Rust) é
+# bem mais rápido que o openpyxl, mas é opcional: pip install python-calamine
+MOTORES_AUTOMATICOS = ("calamine", "openpyxl")
+_MODULOS_MOTOR = {"calamine": "python_calamine", "openpyxl": "openpyxl"}
+
+
+def motor_disponivel(motor: str) -> bool:
+    return importlib.util.find_spec(_MODULOS_MOTOR[motor]) is not None
+
+
+def escolher_motor(motor: str | None = None) -> str:
+    motor = motor or MOTOR_LEITURA
+    if motor != "auto":
+        return motor
+    for candidato in MOTORES_AUTOMATICOS:
+        if motor_disponivel(candidato):
+            return candidato
+    return "openpyxl"
+
+
+def _seletor_colunas(colunas, ignorar_maiusculas=False):
+    if ignorar_maiusculas:
+        nomes = {str(coluna).lower() for coluna in colunas}
+
+        def selecionar(coluna):
+            return str(coluna).lower() in nomes
+
+    else:
+        nomes = {str(coluna) for coluna in colunas}
+
+        def selecionar(coluna):
+            return str(coluna) in nomes
+
+    return selecionar
+
+
+def ler_planilha(
+    caminho, colunas, dtype=None, motor=None, ignorar_maiusculas=False
+) -> pd.DataFrame:
+    """Lê apenas as ``colunas`` pedidas da primeira aba de ``caminho``.
+
+    Colunas ausentes na planilha são ignoradas; quem chama decide o que fazer
+    quando uma coluna obrigatória não vier. Se o motor escolhido falhar ao
+    abrir o arquivo, a leitura é refeita com o openpyxl.
+    """
+    selecionar = _seletor_colunas(colunas, ignorar_maiusculas)
+    motor = escolher_motor(motor)
+    try:
+        return pd.read_excel(caminho, usecols=selecionar, dtype=dtype, engine=motor)
+    except Exception:
+        if motor == "openpyxl":
+            raise
+        return pd.read_excel(
+            caminho, usecols=selecionar, dtype=dtype, engine="openpyxl"
+        )
+
+
+def _ler_abas(caminho, pedidos, dtype, motor) -> dict[str, pd.DataFrame]:
+    with pd.ExcelFile(caminho, engine=motor) as arquivo:
+        abas = {str(aba).strip().upper(): aba for aba in arquivo.sheet_names}
+        return {
+            nome: arquivo.parse(
+                abas[nome.upper()],
+                usecols=_seletor_colunas(colunas, ignorar_maiusculas),
+                dtype=dtype,
+            )
+            for nome, (colunas, ignorar_maiusculas) in pedidos.items()
+            if nome.upper() in abas
+        }
+
+
+def ler_abas(caminho, pedidos: dict, dtype=None, motor=None) -> dict[str, pd.DataFrame]:
+    """Lê várias abas de ``caminho`` abrindo o arquivo uma única vez.
+
+    ``pedidos`` mapeia o nome de cada aba (sem diferenciar maiúsculas) para
+    ``(colunas, ignorar_maiusculas)``, com o mesmo sentido de
+    ``ler_planilha``. Abas que não existem ficam de fora do resultado.
+    """
+    motor = escolher_motor(motor)
+    try:
+        return _ler_abas(caminho, pedidos, dtype, motor)
+    except Exception:
+        if motor == "openpyxl":
+            raise
+        return _ler_abas(caminho, pedidos, dtype, "openpyxl")
+
+
+def listar_abas(caminho, motor=None) -> list[str]:
+    """Nomes das abas de ``caminho``, sem converter o conteúdo de nenhuma."""
+    motor = escolher_motor(motor)
+    try:
+        with pd.ExcelFile(caminho, engine=motor) as arquivo:
+            return list(arquivo.sheet_names)
+    except Exception:
+        if motor == "openpyxl":
+            raise
+        with pd.ExcelFile(caminho, engine="openpyxl") as arquivo:
+            return list(arquivo.sheet_names)
+
+
+# Textos que o read_excel trata como célula vazia (na_values padrão do pandas).
+TEXTOS_NULOS = frozenset(
+    [
+        "",
+        "#N/A",
+        "#N/A N/A",
+        "#NA",
+        "-1.#IND",
+        "-1.#QNAN",
+        "-NaN",
+        "-nan",
+        "1.#IND",
+        "1.#QNAN",
+        "<NA>",
+        "N/A",
+        "NA",
+        "NULL",
+        "NaN",
+        "None",
+        "n/a",
+        "nan",
+        "null",
+    ]
+)
+
+
+def _como_texto(valor):
+    # Mesmo texto que o read_excel com dtype=str: números inteiros sem ".0" e
+    # células vazias (ou com um dos TEXTOS_NULOS) como NaN.
+    if valor is None or isinstance(valor, str) and valor in TEXTOS_NULOS:
+        return math.nan
+    if isinstance(valor, float) and valor.is_integer():
+        return str(int(valor))
+    return str(valor)
+
+
+def _montar_bloco(linhas, nomes, inicio) -> pd.DataFrame:
+    return pd.DataFrame(
+        linhas,
+        columns=nomes,
+        index=pd.RangeIndex(inicio, inicio + len(linhas)),
+        dtype=object,
+    )
+
+
+def ler_planilha_em_blocos(
+    caminho, colunas, linhas_por_bloco, ignorar_maiusculas=False
+):
+    """Lê a primeira aba de ``caminho`` como texto, ``linhas_por_bloco`` por vez.
+
+    Gera DataFrames com as mesmas colunas, textos e índice (posição da linha
+    de dados) que ``ler_planilha(..., dtype=str)`` daria para o mesmo trecho.
+    Usa o openpyxl em modo
+    somente leitura, que percorre o xml da aba sem carregá-la inteira: a
+    memória fica limitada ao tamanho do bloco, não ao da planilha.
+    """
+    # Importado aqui: o openpyxl carrega o PIL, que a CLI não deve importar
+    # na partida.
+    import openpyxl
+
+    selecionar = _seletor_colunas(colunas, ignorar_maiusculas)
+    workbook = openpyxl.load_workbook(caminho, read_only=True, data_only=True)
+    try:
+        linhas = workbook.worksheets[0].iter_rows(values_only=True)
+        cabecalho = next(linhas, None) or ()
+        posicoes = [
+            i
+            for i, nome in enumerate(cabecalho)
+            if nome is not None and selecionar(nome)
+        ]
+        nomes = [str(cabecalho[i]) for i in posicoes]
+
+        vazia = [math.nan] * len(posicoes)
+        inicio = 0
+        bloco = []
+        vazias_pendentes = 0
+        for linha in linhas:
+            # Linhas vazias só contam se houver dados depois delas, como no
+            # read_excel, que descarta apenas as do fim da aba.
+            if all(valor is None for valor in linha):
+                vazias_pendentes += 1
+                continue
+            novas = [vazia] * vazias_pendentes
+            novas.append(
+                [
+                    _como_texto(linha[i]) if i < len(linha) else math.nan
+                    for i in posicoes
+                ]
+            )
+            vazias_pendentes = 0
+            for nova in novas:
+                bloco.append(nova)
+                if len(bloco) == linhas_por_bloco:
+                    yield _montar_bloco(bloco, nomes, inicio)
+                    inicio += len(bloco)
+                    bloco = []
+        if bloco or inicio == 0:
+            yield _montar_bloco(bloco, nomes, inicio)
+    finally:
+        workbook.close()
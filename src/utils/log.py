@@ -1,12 +1,148 @@
+import atexit
+import os
+import time
+from collections import defaultdict
 from datetime import datetime
 
+from config import LOG_CONFIG
 
-def escrever_no_log(mensagem, caminho_log):
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    mensagem_com_timestamp = f"[{timestamp}] {mensagem}"
-    try:
-        with open(caminho_log, "a", encoding="utf-8") as log_file:
-            log_file.write(mensagem_com_timestamp + "\n")
-        print(mensagem_com_timestamp)
-    except Exception as e:
-        print(f"Erro ao escrever no log: {e}")
+NIVEIS = {"DEBUG": 10, "INFO": 20, "AVISO": 30, "ERRO": 40}
+
+
+class LogProcessamento:
+    """Log com arquivo aberto durante toda a execução e escrita em lote.
+
+    As mensagens ficam em buffer e vão para o disco a cada ``intervalo_flush``
+    mensagens ou ``intervalo_segundos``, o que vier primeiro; avisos e erros
+    são gravados na hora. Eventos repetidos por linha (ex.: CPF trocado pelo
+    titular) são apenas contados e viram uma linha de resumo; o detalhe de
+    cada um vai para ``caminho_detalhes``, se informado.
+    """
+
+    def __init__(
+        self,
+        caminho_log,
+        nivel="INFO",
+        eco_console=True,
+        intervalo_flush=100,
+        intervalo_segundos=2.0,
+        caminho_detalhes=None,
+    ):
+        self.caminho_log = caminho_log
+        self.nivel = NIVEIS[nivel]
+        self.eco_console = eco_console
+        self.intervalo_flush = intervalo_flush
+        self.intervalo_segundos = intervalo_segundos
+        self.caminho_detalhes = caminho_detalhes
+        self.eventos = defaultdict(int)
+        self._buffer = []
+        self._ultimo_flush = time.monotonic()
+        self._arquivo = None
+        self._arquivo_detalhes = None
+
+    def escrever(self, mensagem, nivel="INFO"):
+        if NIVEIS[nivel] < self.nivel:
+            return
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        mensagem_com_timestamp = f"[{timestamp}] {mensagem}"
+        self._buffer.append(mensagem_com_timestamp + "\n")
+        if self.eco_console:
+            print(mensagem_com_timestamp)
+        if (
+            NIVEIS[nivel] >= NIVEIS["AVISO"]
+            or len(self._buffer) >= self.intervalo_flush
+            or time.monotonic() - self._ultimo_flush >= self.intervalo_segundos
+        ):
+            self.flush()
+
+    def evento(self, tipo, detalhe=None):
+        """Conta um evento por linha; o detalhe só é gravado no arquivo de detalhes."""
+        self.eventos[tipo] += 1
+        if detalhe is not None and self.caminho_detalhes:
+            if self._arquivo_detalhes is None:
+                self._arquivo_detalhes = open(
+                    self.caminho_detalhes, "a", encoding="utf-8"
+                )
+            self._arquivo_detalhes.write(f"{detalhe}\n")
+
+    def registrar_eventos(self, tipo, total, detalhes=()):
+        """Conta ``total`` eventos de uma vez, gravando ``detalhes`` em bloco."""
+        self.eventos[tipo] += total
+        if self.caminho_detalhes:
+            linhas = [f"{detalhe}\n" for detalhe in detalhes]
+            if linhas:
+                if self._arquivo_detalhes is None:
+                    self._arquivo_detalhes = open(
+                        self.caminho_detalhes, "a", encoding="utf-8"
+                    )
+                self._arquivo_detalhes.writelines(linhas)
+
+    def resumir(self, tipo, modelo, nivel="INFO"):
+        """Escreve uma linha de resumo com o total de eventos de ``tipo``.
+
+        ``modelo`` recebe o total em ``{total}``, ex.: "🔄 {total} CPF(s) alterados".
+        """
+        total = self.eventos.pop(tipo, 0)
+        if total:
+            self.escrever(modelo.format(total=total), nivel)
+        return total
+
+    def flush(self):
+        self._ultimo_flush = time.monotonic()
+        if not self._buffer:
+            return
+        try:
+            if self._arquivo is None:
+                self._arquivo = open(self.caminho_log, "a", encoding="utf-8")
+            self._arquivo.writelines(self._buffer)
+            self._arquivo.flush()
+        except Exception as e:
+            print(f"Erro ao escrever no log: {e}")
+        self._buffer.clear()
+
+    def fechar(self):
+        self.flush()
+        for arquivo in (self._arquivo, self._arquivo_detalhes):
+            if arquivo is not None:
+                arquivo.close()
+        self._arquivo = None
+        self._arquivo_detalhes = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.fechar()
+
+
+_logs_abertos = {}
+
+
+def obter_log(caminho_log, **opcoes) -> LogProcessamento:
+    """Retorna o log aberto para ``caminho_log``, criando-o na primeira chamada.
+
+    Sem ``opcoes``, usa ``LOG_CONFIG``; com ``detalhes`` ligado, os eventos vão
+    para ``<log>_detalhes.txt``.
+    """
+    chave = os.fspath(caminho_log)
+    if chave not in _logs_abertos:
+        configuracao = {**LOG_CONFIG, **opcoes}
+        detalhes = configuracao.pop("detalhes", False)
+        if detalhes and not configuracao.get("caminho_detalhes"):
+            raiz, extensao = os.path.splitext(chave)
+            configuracao["caminho_detalhes"] = f"{raiz}_detalhes{extensao or '.txt'}"
+        _logs_abertos[chave] = LogProcessamento(chave, **configuracao)
+    return _logs_abertos[chave]
+
+
+def fechar_logs():
+    while _logs_abertos:
+        _, log = _logs_abertos.popitem()
+        log.fechar()
+
+
+atexit.register(fechar_logs)
+
+
+def escrever_no_log(mensagem, caminho_log, nivel="INFO"):
+    obter_log(caminho_log).escrever(mensagem, nivel)
@@ -0,0 +1,29 @@
+"""Validação dos argumentos da execução (mês e código AL).
+
+Sem dependências além da biblioteca padrão: a CLI usa estas funções ainda na
+leitura dos argumentos, antes de importar o pandas e o numpy.
+"""
+
+import datetime
+
+
+def validar_ano_mes(ano_mes: str) -> str:
+    """Valida um mês de referência no formato AAAAMM e o devolve."""
+    try:
+        datetime.datetime.strptime(ano_mes, "%Y%m")
+    except (TypeError, ValueError):
+        raise ValueError(f"Mês de referência inválido: {ano_mes!r} (use AAAAMM)")
+    return ano_mes
+
+
+def normalizar_codigo_al(valor):
+    """Padroniza o código AL como "AL <código>"; retorna None se vazio."""
+    valor = (valor or "").strip()
+    if not valor:
+        return None
+    valor_upper = valor.upper()
+    if valor_upper.startswith("AL "):
+        return valor
+    if valor_upper.startswith("AL"):
+        return "AL " + valor[2:].strip()
+    return "AL " + valor
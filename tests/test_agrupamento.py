@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from processamento.agrupamento import (
+    ORDEM_CPF,
+    ORDEM_PRIMEIRA_OCORRENCIA,
+    acumular_por_cpf,
+    agrupar_por_cpf,
+)
+
+DF = pd.DataFrame({"CPF": [30, 10, 30, 20, 10], "VALOR": [1.0, 2.0, 3.0, 4.0, 5.0]})
+
+
+def test_primeira_ocorrencia_mantem_a_ordem_da_planilha():
+    agrupado = agrupar_por_cpf(DF, "CPF", "VALOR", ordem=ORDEM_PRIMEIRA_OCORRENCIA)
+    assert agrupado["CPF"].tolist() == [30, 10, 20]
+    assert agrupado["VALOR"].tolist() == [4.0, 7.0, 4.0]
+
+
+def test_ordem_por_cpf():
+    agrupado = agrupar_por_cpf(DF, "CPF", "VALOR", ordem=ORDEM_CPF)
+    assert agrupado["CPF"].tolist() == [10, 20, 30]
+    assert agrupado["VALOR"].tolist() == [7.0, 4.0, 4.0]
+
+
+def test_ordem_desconhecida():
+    with pytest.raises(ValueError):
+        agrupar_por_cpf(DF, "CPF", "VALOR", ordem="valor")
+
+
+def test_acumular_em_blocos_da_a_soma_do_pandas():
+    gerador = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "CPF": gerador.integers(0, 50, 2_000),
+            "VALOR": gerador.integers(0, 100_000, 2_000) / 1000,
+        }
+    )
+    acumulado = None
+    for inicio in range(0, len(df), 300):
+        acumulado = acumular_por_cpf(
+            acumulado, df[inicio : inicio + 300], "CPF", "VALOR"
+        )
+
+    esperado = agrupar_por_cpf(df, "CPF", "VALOR")
+    assert acumulado["CPF"].tolist() == esperado["CPF"].tolist()
+    # Bit a bit: a compensação de Kahan passa de um bloco para o outro.
+    assert acumulado["VALOR"].tolist() == esperado["VALOR"].tolist()
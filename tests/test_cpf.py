@@ -0,0 +1,41 @@
+import numpy as np
+
+from utils.cpf import cpfs_de_textos, cpfs_validos
+
+
+def _cpf_valido(cpf: int) -> bool:
+    """Conferência dígito a dígito, como a regra da Receita é descrita."""
+    digitos = [int(d) for d in f"{cpf:011d}"]
+    if cpf >= 10**11 or len(set(digitos)) == 1:
+        return False
+    for posicao in (9, 10):
+        soma = sum(d * (posicao + 1 - i) for i, d in enumerate(digitos[:posicao]))
+        if (soma * 10) % 11 % 10 != digitos[posicao]:
+            return False
+    return True
+
+
+def test_cpfs_validos_confere_com_a_regra_escalar():
+    gerador = np.random.default_rng(0)
+    cpfs = np.concatenate(
+        [
+            gerador.integers(0, 10**11, 20_000),
+            np.arange(10) * 11_111_111_111,
+            [0, 191, 12345678909, 98765432100, 10**11 - 1],
+        ]
+    )
+    esperado = [_cpf_valido(int(cpf)) for cpf in cpfs]
+    assert cpfs_validos(cpfs).tolist() == esperado
+    assert sum(esperado) > 100
+
+
+def test_cpfs_validos_fora_do_intervalo():
+    assert not cpfs_validos([-12345678909, 10**11 + 12345678909]).any()
+
+
+def test_cpfs_de_textos():
+    numeros, convertidos = cpfs_de_textos(
+        ["12345678909", "191", "123.456.789-09", "123456789090", "12a", None, ""]
+    )
+    assert convertidos.tolist() == [True, True, True, False, False, False, False]
+    assert numeros[convertidos].tolist() == [12345678909, 191, 12345678909]
@@ -0,0 +1,65 @@
+import pandas as pd
+
+from processamento.esquema import (
+    MOTIVO_DIGITOS,
+    MOTIVO_ILEGIVEL,
+    converter_cpfs,
+    converter_valores,
+    tipar_entrada,
+)
+
+
+def _textos(valores):
+    return pd.Series(valores, dtype=object)
+
+
+def test_converter_cpfs_aceita_pontuacao_e_zeros_perdidos():
+    cpfs, invalidos = converter_cpfs(
+        _textos(["123.456.789-09", "191", "12345678909.0", " 191 ", "123 456 789 09"])
+    )
+    assert cpfs.tolist() == [12345678909, 191, 12345678909, 191, 12345678909]
+    assert not invalidos.any()
+
+
+def test_converter_cpfs_rejeita():
+    textos = _textos(["abc", "123456789012", "12,3", "98e6612658355", "1e4294967296"])
+    cpfs, invalidos = converter_cpfs(textos)
+    assert invalidos.all()
+    assert cpfs.isna().all()
+
+
+def test_converter_cpfs_vazio_nao_e_invalido():
+    cpfs, invalidos = converter_cpfs(_textos([None, "", "  "]))
+    assert cpfs.isna().all()
+    assert not invalidos.any()
+
+
+def test_converter_valores_em_fracoes():
+    valores, invalidos = converter_valores(_textos(["12.345", "-0.01", "1e3", "7"]))
+    assert valores.tolist() == [12_345_000, -10_000, 1_000_000_000, 7_000_000]
+    assert not invalidos.any()
+
+
+def test_converter_valores_rejeita():
+    textos = _textos(
+        ["abc", "inf", "-inf", "nan", "1e12", "98e6612658355", "1e4294967296", None]
+    )
+    valores, invalidos = converter_valores(textos)
+    assert invalidos.tolist() == [True] * 7 + [False]
+    assert valores.isna().all()
+
+
+def test_tipar_entrada_registra_os_rejeitados():
+    df = pd.DataFrame(
+        {
+            "CPF": ["12345678909", "12345678900", "x", "98765432100"],
+            "VALOR": ["1", "2", "3", "1e4294967296"],
+        }
+    )
+    entrada = tipar_entrada(df, "CPF", "VALOR")
+    assert entrada.dados.index.tolist() == [0]
+    assert list(entrada.rejeitados.itertuples(index=False, name=None)) == [
+        (3, "CPF", "12345678900", MOTIVO_DIGITOS),
+        (4, "CPF", "x", MOTIVO_ILEGIVEL),
+        (5, "VALOR", "1e4294967296", MOTIVO_ILEGIVEL),
+    ]
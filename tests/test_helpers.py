@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from utils.helpers import arredondar_centavos, distribuir_centavos, truncar_centavos
+
+
+@pytest.mark.parametrize("alvo", [603, 597, 606, 594])
+def test_distribuir_centavos_fecha_no_alvo(alvo):
+    centavos = np.array([100, 150, 120, 130, 50, 50])
+    ajustados, alterados = distribuir_centavos(centavos, alvo)
+    assert int(ajustados.sum()) == alvo
+    assert alterados == alvo - 600
+    # Um centavo por linha, a partir da primeira.
+    diferencas = ajustados - centavos
+    assert diferencas[: abs(alterados)].tolist() == [np.sign(alterados)] * abs(
+        alterados
+    )
+    assert not diferencas[abs(alterados) :].any()
+
+
+def test_distribuir_centavos_no_maximo_um_por_linha():
+    # Como antes: o que passa de um centavo por CPF fica para a linha de
+    # desconto, fechada pela diferença.
+    ajustados, alterados = distribuir_centavos([10, 20, 30], 50)
+    assert ajustados.tolist() == [9, 19, 29]
+    assert alterados == -3
+
+
+def test_distribuir_centavos_sem_diferenca_nao_altera():
+    centavos = np.array([1, 2, 3])
+    ajustados, alterados = distribuir_centavos(centavos, 6)
+    assert ajustados.tolist() == [1, 2, 3]
+    assert alterados == 0
+
+
+def test_arredondar_centavos_usa_o_valor_binario():
+    # 2.675 é guardado como 2.67499999..., como no antigo arredondar.
+    valores = [2.675, 2.665, 0.125, -0.125, 1.005, 10.0]
+    assert arredondar_centavos(valores).tolist() == [267, 267, 13, -13, 100, 1000]
+
+
+def test_truncar_centavos_mantem_valores_ja_em_centavos():
+    valores = [0.29, 616.09, 2.0199999999999996, 1.999, -1.999]
+    assert truncar_centavos(valores).tolist() == [29, 61609, 201, 199, -199]
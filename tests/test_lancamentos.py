@@ -0,0 +1,34 @@
+from processamento.lancamentos import (
+    COLUNAS,
+    iterar_lancamentos,
+    montar_lancamentos,
+    montar_linha,
+)
+
+
+def test_linhas_do_bloco():
+    bloco = montar_lancamentos(
+        [191, 12345678909],
+        [1.5, 0.29],
+        {"DOCUMENTO": "ME0324", "HISTORICO": "ESPORTE"},
+        sequencia_inicial=5,
+    )
+    linhas = [dict(zip(COLUNAS, linha)) for linha in bloco.linhas()]
+
+    assert len(bloco) == 2
+    assert [len(linha) for linha in linhas] == [len(COLUNAS)] * 2
+    assert [linha["CLIENTE"] for linha in linhas] == ["00000000191", "12345678909"]
+    assert [linha["VALOR"] for linha in linhas] == [1.5, 0.29]
+    assert [linha["SEQUENCIA"] for linha in linhas] == [5, 6]
+    assert {linha["DOCUMENTO"] for linha in linhas} == {"ME0324"}
+    assert {linha["LOTE"] for linha in linhas} == {"CTB"}
+
+
+def test_iterar_lancamentos_poe_as_linhas_avulsas_depois_do_bloco():
+    bloco = montar_lancamentos([191], [2.0], {})
+    total = montar_linha({"VALOR": 2.0, "INDICADOR DE CONTA": "C", "SEQUENCIA": 2})
+    linhas = [dict(zip(COLUNAS, linha)) for linha in iterar_lancamentos(bloco, [total])]
+    assert [(linha["SEQUENCIA"], linha["INDICADOR DE CONTA"]) for linha in linhas] == [
+        (1, "D"),
+        (2, "C"),
+    ]
@@ -0,0 +1,35 @@
+import json
+
+from processamento.lote import carregar_manifesto, executar_lote
+
+
+def _manifesto(tmp_path, conteudo):
+    caminho = tmp_path / "manifesto.json"
+    caminho.write_text(json.dumps(conteudo), encoding="utf-8")
+    return carregar_manifesto(caminho)
+
+
+def test_manifesto_normaliza_os_codigos(tmp_path):
+    manifesto = _manifesto(
+        tmp_path, {"u": {"me": "123", "OD": 456, "RF": "AL 789", "*": "al321"}}
+    )
+    assert manifesto == {
+        "u": {"ME": "AL 123", "OD": "AL 456", "RF": "AL 789", "*": "AL 321"}
+    }
+
+
+def test_codigo_nulo_ou_vazio_conta_como_ausente(tmp_path):
+    manifesto = _manifesto(
+        tmp_path, {"u": {"ME": None, "OD": "", "RF": "  "}, "u/202403": {"*": None}}
+    )
+    assert manifesto == {"u": {}, "u/202403": {}}
+
+    pasta = tmp_path / "lote" / "u" / "202403"
+    pasta.mkdir(parents=True)
+    for arquivo in ("ME.xlsx", "OD.xlsx", "RF.xlsx"):
+        (pasta / arquivo).touch()
+    relatorio = executar_lote(
+        tmp_path / "lote", manifesto, caminho_relatorio=tmp_path / "relatorio.json"
+    )
+    assert relatorio["resumo"] == {"sem_codigo_al": 3}
+    assert {job["codigo_al"] for job in relatorio["jobs"]} == {None}
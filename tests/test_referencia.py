@@ -0,0 +1,32 @@
+import os
+import shutil
+
+import pytest
+
+from benchmarks.equivalencia import CODIGO_AL, MES_REFERENCIA, comparar_saidas
+from benchmarks.referencia import ESPERADO, casos
+from processamento.contexto import criar_contexto
+from processamento.execucao import PROCESSADORES, REGRAS
+
+
+@pytest.mark.parametrize(
+    "tipo, pasta", casos(), ids=[os.path.basename(pasta) for _, pasta in casos()]
+)
+def test_saida_igual_a_referencia(tipo, pasta, tmp_path):
+    """Saída igual à gravada por ``python -m benchmarks.referencia``."""
+    arquivo = REGRAS[tipo].arquivo
+    entrada = tmp_path / arquivo
+    shutil.copyfile(os.path.join(pasta, arquivo), entrada)
+    saida = tmp_path / "saida.xlsx"
+
+    PROCESSADORES[arquivo](
+        entrada,
+        saida,
+        CODIGO_AL,
+        tmp_path / "log.txt",
+        criar_contexto(MES_REFERENCIA),
+    )
+
+    comparacao = comparar_saidas(os.path.join(pasta, ESPERADO), saida)
+    assert comparacao.primeira is None
+    assert comparacao.invariantes == []
@@ -0,0 +1,54 @@
+import pandas as pd
+
+from processamento.pipeline import preparar_entrada
+from processamento.regras import compilar_regras
+from processamento.titulares import resolver_titulares
+from utils.cpf import completar_cpfs
+
+A, B, C = completar_cpfs([123456789, 987654321, 111444777]).tolist()
+
+
+def _entrada(cpfs, titulares):
+    return pd.DataFrame(
+        {
+            "CPF": pd.array(cpfs, dtype="Int64"),
+            "CPF_TITULAR": pd.array(titulares, dtype="Int64"),
+        }
+    )
+
+
+def test_troca_pelo_titular_quando_informado():
+    df = _entrada([A, B, C], [B, None, C])
+    resultado = resolver_titulares(df, tamanho_amostra=None)
+    assert resultado.cpfs.tolist() == [B, B, C]
+    assert resultado.total == 1
+    assert resultado.amostra == [(A, B)]
+
+
+def test_od_so_conta_titular_diferente_do_cpf():
+    df = _entrada([A, B, C, None], [A, A, None, B])
+    resultado = resolver_titulares(df, somente_se_diferente=True, tamanho_amostra=None)
+    assert resultado.cpfs.tolist() == [A, A, C, B]
+    # O titular igual ao CPF não é uma troca; CPF nulo com titular é.
+    assert resultado.total == 2
+    assert resultado.amostra == [(B, A), (pd.NA, B)]
+
+
+def test_sem_coluna_de_titular_devolve_os_cpfs():
+    df = pd.DataFrame({"CPF": pd.array([A, B], dtype="Int64")})
+    resultado = resolver_titulares(df)
+    assert resultado.cpfs.tolist() == [A, B]
+    assert resultado.total == 0
+
+
+def test_rf_aceita_coluna_cpf_em_minusculas(tmp_path):
+    regras = compilar_regras()
+    # A última linha é o total da planilha de origem e é descartada.
+    df = pd.DataFrame({"Cpf": [str(A), str(B), None], "VALOR": ["1.50", "2", "3.50"]})
+    log = tmp_path / "rf.log"
+
+    entrada = preparar_entrada(regras["RF"], df, log)
+    assert entrada is not None
+    assert entrada.dados["CPF"].tolist() == [A, B]
+
+    assert preparar_entrada(regras["OD"], df, log) is None